@@ -1,9 +1,10 @@
-import json
 import logging
-from typing import Awaitable, Callable, Literal, Optional, Union
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Literal, Optional, Union
 
 from aiohttp import ClientSession
 from typeguard import check_type
+from yarl import URL
 
 from pygaposa.api_types import (
     ApiControlRequest,
@@ -21,8 +22,15 @@ from pygaposa.api_types import (
     ScheduleEventType,
     ScheduleUpdate,
 )
-
-logging.basicConfig(level=logging.DEBUG)
+from pygaposa.json_utils import dumps, loads
+
+ENDPOINTS = (
+    "/v1/login",
+    "/v1/users",
+    "/v1/control",
+    "/v1/schedules",
+    "/v1/schedules/event",
+)
 
 
 class GaposaApi:
@@ -46,20 +54,25 @@ class GaposaApi:
         serverUrl: Optional[str] = None,
     ):
         self.serverUrl = serverUrl or GaposaApi.serverUrl
+        self.urls = endpointUrls(self.serverUrl)
         self.websession = websession
         self.getToken = getToken
         self.logger = logging.getLogger("gaposa")
+        self.client: Optional[str] = None
+        self.role: Optional[int] = None
+        self.serial: Optional[str] = None
+        self.authHeader: Optional[str] = None
 
     def clone(self) -> "GaposaApi":
         """Create a new GaposaApi instance with the same configuration as this one.
 
         This enables us to create instances of the API with different configurations,
-        for example for different clients and devices.
+        for example for different clients.
         """
         result = GaposaApi(self.websession, self.getToken, self.serverUrl)
-        if hasattr(self, "client"):
+        if self.client is not None and self.role is not None:
             result.setClientAndRole(self.client, self.role)
-        if hasattr(self, "serial"):
+        if self.serial is not None:
             result.setSerial(self.serial)
         return result
 
@@ -67,99 +80,119 @@ class GaposaApi:
         """Set the client and role for this API instance."""
         self.client = client
         self.role = role
+        self.authHeader = dumps({"role": role, "client": client}).decode()
 
     def setSerial(self, serial: str):
-        """Set the serial number for this API instance."""
+        """Set the default device serial number for this API instance."""
         self.serial = serial
 
+    def deviceSerial(self, serial: Optional[str]) -> str:
+        """Return the given device serial, or the default set with setSerial."""
+        if serial is None:
+            serial = self.serial
+        assert serial is not None
+        return serial
+
     async def login(self) -> ApiLoginResponse:
         """Log in to the GAPOSA API."""
-        response = await self.request("/v1/login")
-        return check_type(response, ApiLoginResponse)
+        return await self.request("/v1/login", responseType=ApiLoginResponse)
 
     async def users(self) -> ApiUsersResponse:
         """Get the list of users for the client set on this API instance."""
-        assert hasattr(self, "client")
-        response = await self.request("/v1/users")
-        return check_type(response, ApiUsersResponse)
+        assert self.client is not None
+        return await self.request("/v1/users", responseType=ApiUsersResponse)
 
     async def control(
         self,
         command: Command,
         scope: Union[Literal["channel"], Literal["group"]],
         id: str,
+        serial: Optional[str] = None,
     ):
         """Send a control command to a channel or group.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
-        assert hasattr(self, "client")
-        assert hasattr(self, "serial")
+        assert self.client is not None
+        serial = self.deviceSerial(serial)
         if scope == "channel":
             payload: ApiControlRequest = {
-                "serial": self.serial,
-                "data": {"cmd": command.value, "bank": 0, "address": int(id)},
+                "serial": serial,
+                "data": {"cmd": command, "bank": 0, "address": int(id)},
             }
         else:
             payload = {
-                "serial": self.serial,
+                "serial": serial,
                 "group": id,
-                "data": {"cmd": command.value},
+                "data": {"cmd": command},
             }
 
-        response = await self.request("/v1/control", "POST", payload)
-        return check_type(response, ApiControlResponse)
+        return await self.request(
+            "/v1/control", "POST", payload, responseType=ApiControlResponse
+        )
 
-    async def addSchedule(self, schedule: ScheduleUpdate) -> ApiScheduleResponse:
+    async def addSchedule(
+        self, schedule: ScheduleUpdate, serial: Optional[str] = None
+    ) -> ApiScheduleResponse:
         """Add a new schedule. This is a convenience method for addOrUpdateSchedule.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
         assert "Id" not in schedule
-        return await self.addOrUpdateSchedule(schedule)
+        return await self.addOrUpdateSchedule(schedule, serial)
 
-    async def updateSchedule(self, schedule: ScheduleUpdate) -> ApiScheduleResponse:
+    async def updateSchedule(
+        self, schedule: ScheduleUpdate, serial: Optional[str] = None
+    ) -> ApiScheduleResponse:
         """Update an existing schedule.
 
         This is a convenience method for addOrUpdateSchedule.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
         assert "Id" in schedule
-        return await self.addOrUpdateSchedule(schedule)
+        return await self.addOrUpdateSchedule(schedule, serial)
 
     async def addOrUpdateSchedule(
-        self, schedule: ScheduleUpdate
+        self, schedule: ScheduleUpdate, serial: Optional[str] = None
     ) -> ApiScheduleResponse:
         """Add or update a schedule.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
-        assert hasattr(self, "client")
-        assert hasattr(self, "serial")
+        assert self.client is not None
+        serial = self.deviceSerial(serial)
         method = "POST" if "Id" not in schedule else "PUT"
-        payload: ApiScheduleRequest = {"serial": self.serial, "schedule": schedule}
-        response = await self.request("/v1/schedules", method, payload)
-        return check_type(response, ApiScheduleResponse)
+        payload: ApiScheduleRequest = {"serial": serial, "schedule": schedule}
+        return await self.request(
+            "/v1/schedules", method, payload, responseType=ApiScheduleResponse
+        )
 
-    async def deleteSchedule(self, Id: str) -> ApiScheduleResponse:
+    async def deleteSchedule(
+        self, Id: str, serial: Optional[str] = None
+    ) -> ApiScheduleResponse:
         """Delete a schedule.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
-        assert hasattr(self, "client")
-        assert hasattr(self, "serial")
-        payload: ApiScheduleRequest = {"serial": self.serial, "schedule": {"Id": Id}}
-        response = await self.request("/v1/schedules", "DELETE", payload)
-        return check_type(response, ApiScheduleResponse)
+        assert self.client is not None
+        serial = self.deviceSerial(serial)
+        payload: ApiScheduleRequest = {"serial": serial, "schedule": {"Id": Id}}
+        return await self.request(
+            "/v1/schedules", "DELETE", payload, responseType=ApiScheduleResponse
+        )
 
     async def addScheduleEvent(
-        self, Id: str, Mode: ScheduleEventType, event: ScheduleEventInfo
+        self,
+        Id: str,
+        Mode: ScheduleEventType,
+        event: ScheduleEventInfo,
+        serial: Optional[str] = None,
     ) -> ApiScheduleEventResponse:
         """Add a new event to a schedule.
 
@@ -168,21 +201,26 @@ class GaposaApi:
         Schedules have three events for the three possible operations,
         UP, DONW and PRESET. This is specified in the Mode argument.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
-        assert hasattr(self, "client")
-        assert hasattr(self, "serial")
+        assert self.client is not None
+        serial = self.deviceSerial(serial)
         payload: ApiScheduleEventRequest = {
-            "serial": self.serial,
-            "schedule": {"Id": Id, "Mode": Mode.value},
+            "serial": serial,
+            "schedule": {"Id": Id, "Mode": Mode},
             "event": event,
         }
-        response = await self.request("/v1/schedules/event", "PUT", payload)
-        return check_type(response, ApiScheduleEventResponse)
+        return await self.request(
+            "/v1/schedules/event", "PUT", payload, responseType=ApiScheduleEventResponse
+        )
 
     async def updateScheduleEvent(
-        self, Id: str, Mode: ScheduleEventType, event: ScheduleEventInfo
+        self,
+        Id: str,
+        Mode: ScheduleEventType,
+        event: ScheduleEventInfo,
+        serial: Optional[str] = None,
     ) -> ApiScheduleEventResponse:
         """Update an existing event in a schedule.
 
@@ -191,62 +229,80 @@ class GaposaApi:
         Schedules have three events for the three possible operations,
         UP, DONW and PRESET. This is specified in the Mode argument.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
-        return await self.addScheduleEvent(Id, Mode, event)
+        return await self.addScheduleEvent(Id, Mode, event, serial)
 
     async def deleteScheduleEvent(
-        self, Id: str, Mode: ScheduleEventType
+        self, Id: str, Mode: ScheduleEventType, serial: Optional[str] = None
     ) -> ApiScheduleEventResponse:
         """Delete an event from a schedule.
 
         Schedules have three events for the three possible operations,
         UP, DONW and PRESET. This is specified in the Mode argument.
 
-        This API instance must have been configured with client and device serial
-        before calling this method.
+        This API instance must have been configured with a client before calling
+        this method. The device serial defaults to the one set with setSerial.
         """
-        assert hasattr(self, "client")
-        assert hasattr(self, "serial")
+        assert self.client is not None
+        serial = self.deviceSerial(serial)
         payload: ApiScheduleEventRequest = {
-            "serial": self.serial,
+            "serial": serial,
             "schedule": {"Id": Id, "Mode": Mode},
         }
-        response = await self.request("/v1/schedules/event", "DELETE", payload)
-        return check_type(response, ApiScheduleEventResponse)
+        return await self.request(
+            "/v1/schedules/event",
+            "DELETE",
+            payload,
+            responseType=ApiScheduleEventResponse,
+        )
 
     async def request(
         self,
         endpoint: str,
         method: str = "GET",
         payload: Optional[ApiRequestPayload] = None,
+        responseType: Any = None,
     ):
+        """Send a request to the GAPOSA API and return the decoded response.
+
+        If responseType is given, the response is validated against it.
+        """
         idToken = await self.getToken()
         headers = {
             "Content-Type": "application/json",
             "authorization": f"Bearer {idToken}",
         }
-        if hasattr(self, "client"):
-            headers["auth"] = json.dumps({"role": self.role, "client": self.client})
+        if self.authHeader is not None:
+            headers["auth"] = self.authHeader
 
-        data = json.dumps({"payload": payload}) if payload else None
+        data = dumps({"payload": payload}) if payload else None
 
+        url = self.urls.get(endpoint) or URL(self.serverUrl + endpoint)
         response = await self.websession.request(
             method,
-            self.serverUrl + endpoint,
+            url,
             headers=headers,
             data=data,
             raise_for_status=True,
         )
 
-        self.logger.debug(f"Request: {method} {endpoint}")
-        self.logger.debug(f"Headers: {headers}")
-        self.logger.debug(f"Payload: {data}")
-        self.logger.debug(f"Response: {response}")
+        self.logger.debug("Request: %s %s", method, endpoint)
+        self.logger.debug("Headers: %s", headers)
+        self.logger.debug("Payload: %r", data)
+        self.logger.debug("Response: %s", response)
 
-        responseObject = await response.json()
+        responseObject = loads(await response.read())
 
-        self.logger.debug(f"Response object: {responseObject}")
+        self.logger.debug("Response object: %s", responseObject)
 
+        if responseType is not None:
+            return check_type(responseObject, responseType)
         return responseObject
+
+
+@lru_cache(maxsize=None)
+def endpointUrls(serverUrl: str) -> Dict[str, URL]:
+    """Return the endpoint URLs for a server, shared by every API instance."""
+    return {endpoint: URL(serverUrl + endpoint) for endpoint in ENDPOINTS}
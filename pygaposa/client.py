@@ -90,5 +90,5 @@ class Client(Named):
 
     async def update(self):
         """Update the state of all devices associated with this client."""
-        updates = [device.update() for device in self.devices]
+        updates = [device.update(allow_cached=True) for device in self.devices]
         await asyncio.gather(*updates)
@@ -1,6 +1,5 @@
-import asyncio
 from logging import Logger
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar, Union
 
 from pygaposa.api import GaposaApi
 from pygaposa.api_types import (
@@ -13,7 +12,7 @@ from pygaposa.api_types import (
 from pygaposa.devicebase import DeviceBase
 from pygaposa.firebase import FirestorePath
 from pygaposa.group import Group
-from pygaposa.model import NamedType, Updatable
+from pygaposa.model import Updatable
 from pygaposa.motor import Motor, MotorImpl
 from pygaposa.poll_manager import PollMagagerConfig, PollManager
 from pygaposa.room import Room
@@ -51,21 +50,33 @@ class Device(DeviceBase):
         self.rooms: list[Room] = []
         self.groups: list[Group] = []
         self.schedules: list[Schedule] = []
+        self.motorsById: Dict[str, Motor] = {}
+        self.roomsById: Dict[str, Room] = {}
+        self.groupsById: Dict[str, Group] = {}
+        self.schedulesById: Dict[str, Schedule] = {}
         self.listeners: list[Callable[[], None]] = []
 
-    def onDocumentUpdated(self, updateSchedules: bool = False):
+    def onDocumentUpdated(self, updateSchedules: bool = True):
         DeviceBase.onDocumentUpdated(self)
 
-        self.motors = self.onListUpdated(
-            self.motors, self.document["Channels"], MotorImpl
+        # Motors must be updated first, since rooms, groups and schedules
+        # look up their motors by id
+        self.motorsById = self.onListUpdated(
+            self.motorsById, self.document["Channels"], MotorImpl
         )
-        self.rooms = self.onListUpdated(self.rooms, self.document["Rooms"], Room)
-        self.groups = self.onListUpdated(self.groups, self.document["Groups"], Group)
-        self.schedules = (
-            self.onListUpdated(self.schedules, self.document["Schedule"], Schedule)
-            if "Schedule" in self.document
-            else []
+        self.motors = list(self.motorsById.values())
+        self.roomsById = self.onListUpdated(
+            self.roomsById, self.document["Rooms"], Room
         )
+        self.rooms = list(self.roomsById.values())
+        self.groupsById = self.onListUpdated(
+            self.groupsById, self.document["Groups"], Group
+        )
+        self.groups = list(self.groupsById.values())
+        self.schedulesById = self.onListUpdated(
+            self.schedulesById, self.document.get("Schedule", {}), Schedule
+        )
+        self.schedules = list(self.schedulesById.values())
         if updateSchedules:
             for schedule in self.schedules:
                 schedule.updateEvents(self.scheduleEvents[schedule.id])
@@ -80,52 +91,51 @@ class Device(DeviceBase):
         self.listeners.remove(listener)
 
     def findMotorById(self, id: Union[int, str]) -> Optional[Motor]:
-        return findById(self.motors, str(id))
+        return self.motorsById.get(str(id))
 
     def findRoomById(self, id: Union[int, str]) -> Optional[Room]:
-        return findById(self.rooms, str(id))
+        return self.roomsById.get(str(id))
 
     def findGroupById(self, id: Union[int, str]) -> Optional[Group]:
-        return findById(self.groups, str(id))
+        return self.groupsById.get(str(id))
 
     def findScheduleById(self, id: Union[int, str]) -> Optional[Schedule]:
-        return findById(self.schedules, str(id))
+        return self.schedulesById.get(str(id))
 
     def hasSchedule(self, id: Union[int, str]) -> bool:
         return self.findScheduleById(id) is not None
 
-    def findMotorsById(self, ids: list[int]) -> list[Motor]:
-        motors = [self.findMotorById(id) for id in ids]
-        if any(motor is None for motor in motors):
+    def findMotorsById(self, ids: Iterable[Union[int, str]]) -> list[Motor]:
+        getMotor = self.motorsById.__getitem__
+        try:
+            return [getMotor(str(id)) for id in ids]
+        except KeyError:
             raise Exception("Motor not found")
-        return motors  # type: ignore
 
     def onListUpdated(
         self,
-        items: list[ItemType],
+        items: Dict[str, ItemType],
         update: Dict[str, InitializerType],
         itemType: Callable[["Device", str, InitializerType], ItemType],
-    ) -> list[ItemType]:  # noqa: E501
-        if any(item is None for item in items):
-            self.logger.error("None value in item list")
-        result: list[ItemType] = [
-            item.update(update[item.id]) for item in items if item.id in update
-        ]
-        for key, value in update.items():
-            if findById(items, key) is None:
-                result.append(itemType(self, key, value))
-        return result
+    ) -> Dict[str, ItemType]:
+        """Reconcile the items with an update from the device document.
+
+        Existing items are updated in place, new items are created and items
+        missing from the update are dropped.
+        """
+        return {
+            key: items[key].update(value)
+            if key in items
+            else itemType(self, key, value)
+            for key, value in update.items()
+        }
 
     async def addSchedule(self, Name: str, properties: ScheduleUpdate):
         """Add a new schedule to the device."""
         if any(s.name == Name for s in self.schedules):
             raise Exception("Schedule already exists")
 
-        schedule: ScheduleUpdate = {
-            "Name": Name,
-            "Icon": "noImg",
-            **properties,  # type: ignore
-        }
+        schedule: ScheduleUpdate = {"Name": Name, "Icon": "noImg"} | properties
 
         if "Location" not in schedule and self.location is not None:
             schedule["Location"] = {
@@ -133,13 +143,5 @@ class Device(DeviceBase):
                 "_longitude": self.location[1],
             }
 
-        await self.api.addSchedule(schedule)
-        await asyncio.sleep(2)
+        await self.api.addSchedule(schedule, serial=self.serial)
         await self.update(lambda: any(s.name == Name for s in self.schedules))
-
-
-def findById(items: list[NamedType], id: str) -> Optional[NamedType]:
-    for item in items:
-        if item.id == id:
-            return item
-    return None
@@ -1,15 +1,18 @@
 import asyncio
-from logging import Logger
-from typing import Callable, Optional, Union
+from logging import DEBUG, Logger
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
-from typeguard import check_type
+import aiohttp
+from typeguard import TypeCheckError, check_type
 
 from pygaposa.api import GaposaApi
-from pygaposa.api_types import DeviceDocument, DeviceInfo
+from pygaposa.api_types import DeviceDocument, DeviceInfo, ScheduleEventInfo
 from pygaposa.firebase import FirestorePath
 from pygaposa.model import Motor, Named, Updatable
 from pygaposa.poll_manager import PollMagagerConfig, PollManager
 
+SCHEDULE_MODES = ("UP", "DOWN", "PRESET")
+
 
 class DeviceBase(Updatable):
     """Base class for a device in the Gaposa API.
@@ -31,18 +34,25 @@ class DeviceBase(Updatable):
         info: DeviceInfo,
     ):
         Named.__init__(self, info["Serial"], info["Name"])
-        self.api = api.clone()
+        self.api = api
         self.logger = logger
         self.serial: str = info["Serial"]
-
-        self.api.setSerial(self.serial)
+        self.documentUpdateTime: Optional[str] = None
+        self.location: Optional[tuple[float, float]] = None
+        self.timezone: Optional[str] = None
+        self.scheduleEvents: Dict[str, List[Optional[ScheduleEventInfo]]] = {}
+        self.canListSchedules = True
 
         self.pollManager = PollManager(self.doUpdate, self.logger, config)
 
         self.documentRef = firestore.child("Devices").child(self.serial)
         self.scheduleRef = self.documentRef.child("Schedule")
 
-    async def update(self, condition: Optional[Callable[[], bool]] = None):
+    async def update(
+        self,
+        condition: Optional[Callable[[], bool]] = None,
+        allow_cached: bool = False,
+    ):
         """Update the device state from the API.
 
         Since we have only poll access to the device state, we need to poll the API
@@ -52,34 +62,82 @@ class DeviceBase(Updatable):
 
         We use the PollManager class to manage the polling and to wait for the
         expected state change.
+
+        Callers that only read the state may pass allow_cached to reuse a poll
+        that is still fresh.
         """
-        await self.pollManager.wait_for_condition(condition)
+        await self.pollManager.wait_for_condition(condition, allow_cached)
 
-    async def doUpdate(self):
-        self.snapshot = await self.documentRef.get()
-        if self.snapshot is None:
+    async def doUpdate(self) -> bool:
+        snapshot = await self.documentRef.get()
+        if snapshot is None:
             raise Exception("Failed to get device document")
-        self.document: DeviceDocument = self.snapshot.val()  # type: ignore
-
-        self.documentRef.app.logger.debug(self.document)
 
-        check_type(self.document, DeviceDocument)
+        # Firestore bumps updateTime on every write, so an unchanged value means
+        # the previously parsed and validated document can be reused as is
+        updateTime = snapshot.document["updateTime"]
+        documentChanged = updateTime != self.documentUpdateTime
+        if documentChanged:
+            document: DeviceDocument = snapshot.val()  # type: ignore
+
+            self.documentRef.app.logger.debug(document)
+
+            # Checking the top-level keys is cheap enough to do on every update, but
+            # validating the whole document is costly, so only do that when debugging
+            missing = DeviceDocument.__required_keys__ - document.keys()
+            if missing:
+                raise TypeCheckError(
+                    "device document is missing required key(s): "
+                    + ", ".join(sorted(missing))
+                )
+            if self.logger.isEnabledFor(DEBUG):
+                check_type(document, DeviceDocument)
+
+            self.snapshot = snapshot
+            self.document = document
+
+        schedules = list(self.document.get("Schedule", {}))
+        events = await self.getScheduleEvents(schedules) if schedules else {}
+        scheduleEvents = {
+            schedule: [events.get(schedule + "." + mode) for mode in SCHEDULE_MODES]
+            for schedule in schedules
+        }
+
+        if documentChanged or scheduleEvents != self.scheduleEvents:
+            self.scheduleEvents = scheduleEvents
+            self.onDocumentUpdated()
+            # Only remember the version once it has been fully processed, so a
+            # document that failed validation or processing is retried next poll
+            self.documentUpdateTime = updateTime
+            return True
+        return False
 
-        self.scheduleEvents = {}
-        schedules = self.document["Schedule"] if "Schedule" in self.document else []
-        for schedule in schedules:
-            (scheduleUp, scheduleDown, schedulePreset) = await asyncio.gather(
-                self.scheduleRef.get(schedule + ".UP"),
-                self.scheduleRef.get(schedule + ".DOWN"),
-                self.scheduleRef.get(schedule + ".PRESET"),
-            )
-            self.scheduleEvents[schedule] = [
-                scheduleUp.val() if scheduleUp else None,
-                scheduleDown.val() if scheduleDown else None,
-                schedulePreset.val() if schedulePreset else None,
-            ]
+    async def getScheduleEvents(
+        self, schedules: List[str]
+    ) -> Dict[str, ScheduleEventInfo]:
+        """Get the schedule event documents, keyed by "<schedule>.<mode>".
 
-        self.onDocumentUpdated()
+        The events are fetched in one listing request, which needs the Firestore
+        list permission on the Schedule collection. If that is refused, fall back
+        to getting each event document individually.
+        """
+        if self.canListSchedules:
+            try:
+                return {
+                    document.document["name"].rsplit("/", 1)[-1]: document.val()
+                    for document in await self.scheduleRef.list()
+                }
+            except aiohttp.ClientResponseError as exp:
+                if exp.status != 403:
+                    raise
+                self.logger.debug("Listing schedule events forbidden, using gets")
+                self.canListSchedules = False
+
+        ids = [
+            schedule + "." + mode for schedule in schedules for mode in SCHEDULE_MODES
+        ]
+        documents = await asyncio.gather(*(self.scheduleRef.get(id) for id in ids))
+        return {id: document.val() for id, document in zip(ids, documents) if document}
 
     def onDocumentUpdated(self):
         self.state = self.document["State"]
@@ -96,7 +154,7 @@ class DeviceBase(Updatable):
         self.location = location
         self.timezone = timezone
 
-    def findMotorsById(self, ids: list[int]) -> list[Motor]:
+    def findMotorsById(self, ids: Iterable[Union[int, str]]) -> list[Motor]:
         return []
 
     def hasSchedule(self, id: Union[int, str]) -> bool:
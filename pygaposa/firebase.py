@@ -3,11 +3,13 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, TypedDict, Union
+from typing import Dict, List, Optional, TypedDict, Union, cast
 from urllib.parse import urljoin
 
 import aiohttp
 
+from pygaposa.json_utils import loads
+
 FirebaseConfig = TypedDict(
     "FirebaseConfig",
     {
@@ -81,10 +83,16 @@ class FirebaseAuth:
     def __init__(self, app: FirebaseApp) -> None:
         self.app: FirebaseApp = app
         self.token_expiry: datetime = datetime.today()
+        self.refreshLock: Optional[asyncio.Lock] = None
 
     async def getToken(self) -> str:
         if self.should_refresh_id_token():
-            await self.refresh_id_token()
+            # Concurrent requests near expiry share a single token refresh
+            if self.refreshLock is None:
+                self.refreshLock = asyncio.Lock()
+            async with self.refreshLock:
+                if self.should_refresh_id_token():
+                    await self.refresh_id_token()
         return self.authresponse["idToken"]
 
     async def sign_in_with_email_and_password(self, email: str, password: str) -> None:
@@ -104,7 +112,7 @@ class FirebaseAuth:
         ) as response:
             self.app.logger.debug(response)
             if response.status == 200:
-                self.authresponse: FirebaseAuthResponse = await response.json()
+                self.authresponse: FirebaseAuthResponse = loads(await response.read())
                 self.on_token_received()
             else:
                 raise FirebaseAuthException("Failed to authenticate with Google")
@@ -121,7 +129,7 @@ class FirebaseAuth:
             self.app.logger.debug(response)
 
             if response.status == 200:
-                responseData: SecureTokenRefreshResponse = await response.json()
+                responseData: SecureTokenRefreshResponse = loads(await response.read())
 
                 self.authresponse["idToken"] = responseData["id_token"]
                 self.authresponse["refreshToken"] = responseData["refresh_token"]
@@ -152,6 +160,14 @@ FirestoreDocumentType = TypedDict(
     {"name": str, "fields": Dict, "createTime": str, "updateTime": str},
 )
 
+FirestoreListType = TypedDict(
+    "FirestoreListType",
+    {"documents": List[FirestoreDocumentType], "nextPageToken": str},
+    total=False,
+)
+
+FIRESTORE_PAGE_SIZE = 300
+
 
 class FirestoreDocument:
     def __init__(self, firestore: Firestore, document: FirestoreDocumentType):
@@ -177,20 +193,24 @@ class Firestore:
     def __init__(self, app: FirebaseApp):
         self.app: FirebaseApp = app
 
-    async def _get(self, path: str) -> FirestoreDocumentType | None:
+    async def _get(
+        self, path: str, params: Optional[Dict[str, str]] = None
+    ) -> FirestoreDocumentType | None:
         headers = {}
-        if self.app.hasAuth:
+        if self.app.firebaseAuth is not None:
             token = await self.app.firebaseAuth.getToken()
             headers["Authorization"] = "Bearer " + token
 
         async with self.app.session.get(
             pathjoin("https://firestore.googleapis.com/v1", path),
             headers=headers,
+            params=params,
         ) as response:
             self.app.logger.debug(response)
 
             if response.status == 200:
-                return await response.json()
+                body = await response.read()
+                return loads(body) if body else None
             elif response.status == 404:
                 return None
             else:
@@ -203,6 +223,23 @@ class Firestore:
             return FirestoreDocument(self, document)
         return None
 
+    async def list(self, path: str) -> List[FirestoreDocument]:
+        """List all the documents in a collection, following pagination."""
+        documents: List[FirestoreDocument] = []
+        params = {"pageSize": str(FIRESTORE_PAGE_SIZE)}
+        while True:
+            response = cast(Optional[FirestoreListType], await self._get(path, params))
+            if response is None:
+                break
+            documents.extend(
+                FirestoreDocument(self, document)
+                for document in response.get("documents", [])
+            )
+            if "nextPageToken" not in response:
+                break
+            params["pageToken"] = response["nextPageToken"]
+        return documents
+
 
 def pathjoin(base: str, path: str) -> str:
     base = base[0:-1] if base.endswith("/") else base
@@ -233,11 +270,14 @@ class FirestorePath:
     async def get(self, path: str = ""):
         return await self.firestore.get(pathjoin(self.path, path))
 
+    async def list(self, path: str = ""):
+        return await self.firestore.list(pathjoin(self.path, path))
+
 
 class FirebaseApp:
     @property
     def hasAuth(self) -> bool:
-        return hasattr(self, "firebaseAuth")
+        return self.firebaseAuth is not None
 
     def __init__(
         self,
@@ -247,6 +287,7 @@ class FirebaseApp:
     ) -> None:
         self.config: FirebaseConfig = config
         self.logger = logging.getLogger("gaposa.firebase")
+        self.firebaseAuth: Optional[FirebaseAuth] = None
         if loop:
             self.loop: asyncio.AbstractEventLoop = loop
         else:
@@ -258,8 +299,8 @@ class FirebaseApp:
             self.session = aiohttp.ClientSession()
 
     def auth(self) -> FirebaseAuth:
-        if not self.hasAuth:
-            self.firebaseAuth: FirebaseAuth = FirebaseAuth(self)
+        if self.firebaseAuth is None:
+            self.firebaseAuth = FirebaseAuth(self)
         return self.firebaseAuth
 
     def firestore(self, databaseId: str = "(default)") -> FirestorePath:
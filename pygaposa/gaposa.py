@@ -8,16 +8,16 @@ from pygaposa.api import GaposaApi
 from pygaposa.api_types import ApiLoginResponse
 from pygaposa.client import Client, User
 from pygaposa.firebase import (
+    FirebaseApp,
     FirebaseAuth,
     FirebaseAuthException,
     FirestorePath,
     initialize_app,
 )
 from pygaposa.geoapi import GeoApi
+from pygaposa.json_utils import dumps
 from pygaposa.poll_manager import DefaultPollManagerConfig, PollMagagerConfig
 
-logging.basicConfig(level=logging.DEBUG)
-
 
 class Gaposa:
     """The main class for interacting with the Gaposa API.
@@ -31,10 +31,10 @@ class Gaposa:
     Arguments:
     ---------
         apiKey: The Google API key to use for the Gaopsa API.
-        loop: The event loop to use for the API. If not specified, the default
-            event loop will be used.
+        loop: Unused, the API runs on the event loop that calls it. Accepted for
+            backwards compatibility.
         websession: The aiohttp session to use for the API. If not specified,
-            a new session will be created.
+            a new session will be created on login.
 
     """
 
@@ -46,30 +46,18 @@ class Gaposa:
     ):
         self.apiKey = apiKey
         self.serverUrl = "https://backend.rollapp.tech"
-        self.firebase = initialize_app(
-            {
-                "apiKey": apiKey,
-                "authDomain": "gaposa-prod.firebaseapp.com",
-                "databaseURL": "https://gaposa-prod.firebaseio.com",
-                "projectId": "gaposa-prod",
-                "storageBucket": "gaposa-prod.appspot.com",
-            }
-        )
+        self.firebase: Optional[FirebaseApp] = None
         self.firestore: Optional[FirestorePath] = None
+        self.auth: Optional[FirebaseAuth] = None
+        self.api: Optional[GaposaApi] = None
+        self.geoApi: Optional[GeoApi] = None
+        self.location: Optional[tuple[float, float]] = None
+        self.timeZoneId: Optional[str] = None
         self.logger = logging.getLogger("gaposa")
         self.config = DefaultPollManagerConfig
 
-        if loop:
-            self.loop: asyncio.AbstractEventLoop = loop
-        else:
-            self.loop = asyncio.get_event_loop()
-
-        if websession:
-            self.session: aiohttp.ClientSession = websession
-            self.ownSession: bool = False
-        else:
-            self.session = aiohttp.ClientSession()
-            self.ownSession = True
+        self.session: Optional[aiohttp.ClientSession] = websession
+        self.ownSession: bool = websession is None
 
     def setLocation(self, location: tuple[float, float], timeZoneId: str) -> "Gaposa":
         """Set the physical location and timezone for the API.
@@ -90,39 +78,70 @@ class Gaposa:
         """Open the API and authenticate with Google and Gaposa."""
         self.email = email
         self.password = password
-        self.auth: FirebaseAuth = self.firebase.auth()
-        await self.auth.sign_in_with_email_and_password(self.email, self.password)
-        if not self.firebase.hasAuth:
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60
+                ),
+                json_serialize=lambda obj: dumps(obj).decode(),
+            )
+        session = self.session
+
+        if self.firebase is None:
+            self.firebase = initialize_app(
+                {
+                    "apiKey": self.apiKey,
+                    "authDomain": "gaposa-prod.firebaseapp.com",
+                    "databaseURL": "https://gaposa-prod.firebaseio.com",
+                    "projectId": "gaposa-prod",
+                    "storageBucket": "gaposa-prod.appspot.com",
+                },
+                websession=session,
+            )
+        firebase = self.firebase
+
+        auth = self.auth = firebase.auth()
+        await auth.sign_in_with_email_and_password(self.email, self.password)
+        if not firebase.hasAuth:
             raise GaposaAuthException("Failed to authenticate with Google")
 
-        self.firestore = self.firebase.firestore()
-        self.api = GaposaApi(self.session, self.auth.getToken, self.serverUrl)
-        self.geoApi = GeoApi(self.session, self.apiKey)
+        firestore = self.firestore = firebase.firestore()
+        api = self.api = GaposaApi(session, auth.getToken, self.serverUrl)
+        geoApi = self.geoApi = GeoApi(session, self.apiKey)
 
-        authResponse: ApiLoginResponse = await self.api.login()
+        authResponse: ApiLoginResponse = await api.login()
 
         if authResponse["apiStatus"] != "Success":
             raise GaposaAuthException("Failed to authenticate with Gaposa")
 
-        self.clients: list[tuple[Client, User]] = []
-        for key, value in authResponse["result"]["Clients"].items():
-            client = Client(
-                self.api,
-                self.geoApi,
-                self.firestore,
+        clients = [
+            Client(
+                api,
+                geoApi,
+                firestore,
                 self.config,
                 self.logger,
                 key,
                 value,
             )
-            user = await client.getUserInfo()
-            self.clients.append((client, user))
+            for key, value in authResponse["result"]["Clients"].items()
+        ]
+        users = await asyncio.gather(*(client.getUserInfo() for client in clients))
+        self.clients: list[tuple[Client, User]] = list(zip(clients, users))
 
         return None
 
     async def close(self):
-        if self.ownSession:
+        if self.ownSession and self.session is not None:
             await self.session.close()
+            self.session = None
+            # Everything built on the closed session is rebuilt by the next login
+            self.firebase = None
+            self.firestore = None
+            self.auth = None
+            self.api = None
+            self.geoApi = None
 
     async def update(self):
         """Update the state of all devices."""
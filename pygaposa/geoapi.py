@@ -4,6 +4,7 @@ from typing import Literal, TypedDict
 import aiohttp
 
 from pygaposa.api_types import Location
+from pygaposa.json_utils import loads
 
 
 class ApiTimezoneResponse(TypedDict):
@@ -38,7 +39,7 @@ class GeoApi:
             "https://maps.googleapis.com/maps/api/geocode/json",
             params={"address": address, "key": self.apiKey},
         )
-        data = await response.json()
+        data = loads(await response.read())
         if data["status"] != "OK":
             raise Exception(f"Failed to resolve location: {data['status']}")
         location = data["results"][0]["geometry"]["location"]
@@ -55,7 +56,7 @@ class GeoApi:
             "https://maps.googleapis.com/maps/api/timezone/json", params=query
         )
         if tz.ok:
-            tzresponse: ApiTimezoneResponse = await tz.json()
+            tzresponse: ApiTimezoneResponse = loads(await tz.read())
             if tzresponse["status"] == "OK":
                 return tzresponse["timeZoneId"]
             else:
@@ -1,13 +1,18 @@
 import asyncio
+from operator import itemgetter
 
 from pygaposa.api_types import Command, GroupInfo
 from pygaposa.devicebase import DeviceBase
 from pygaposa.model import Controllable, Named, expectedState
 
+GROUP_FIELDS = itemgetter("Name", "Favourite", "Icon")
+
 
 class Group(Controllable):
     """Represents a group of motors in the Gaposa API."""
 
+    __slots__ = ("device", "favourite", "motors", "icon")
+
     @property
     def state(self):
         # return the state if the state of all motors in self.motors is the same
@@ -25,10 +30,8 @@ class Group(Controllable):
 
     def update(self, info: GroupInfo) -> "Group":
         """Update the group with new state from the API."""
-        self.name = info["Name"]
-        self.favourite = info["Favourite"]
+        self.name, self.favourite, self.icon = GROUP_FIELDS(info)
         self.motors = self.device.findMotorsById(info["Motors"])
-        self.icon = info["Icon"]
         return self
 
     async def up(self, waitForUpdate=True):
@@ -48,13 +51,17 @@ class Group(Controllable):
         await self.command(Command.PRESET, waitForUpdate)
 
     async def command(self, command: Command, waitForUpdate=True):
-        await self.device.api.control(command, "group", self.id)
+        await self.device.api.control(
+            command, "group", self.id, serial=self.device.serial
+        )
         if waitForUpdate:
             await self.updateAfterCommand(command)
         else:
             asyncio.create_task(self.updateAfterCommand(command))
 
-    async def updateAfterCommand(self, command: Command, delay=2):
+    async def updateAfterCommand(self, command: Command, delay=0):
+        expected = expectedState(command)
+        motor = self.motors[0]
         if delay:
             await asyncio.sleep(delay)
-        await self.device.update(lambda: self.motors[0].state == expectedState(command))
+        await self.device.update(lambda: motor.state == expected)
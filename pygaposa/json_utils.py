@@ -0,0 +1,21 @@
+import json
+from typing import Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def dumps(obj) -> bytes:
+    """Serialize an object to JSON, using orjson if it is available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def loads(data: Union[bytes, str]):
+    """Deserialize JSON, using orjson if it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,12 +1,28 @@
 from abc import ABC, abstractmethod
+from operator import itemgetter
 from typing import Optional, TypeVar, Union
 
 from pygaposa.api_types import Channel, Command
 
+MOTOR_FIELDS = itemgetter(
+    "Name",
+    "StatusCode",
+    "State",
+    "HomeRunning",
+    "HomePercent",
+    "HomePaused",
+    "Location",
+    "Icon",
+)
+
 
 class Named:
     """Represents an object with a name and ID."""
 
+    # Slotted to keep the many model objects small; __weakref__ keeps them usable
+    # as weak references, as they were before
+    __slots__ = ("id", "name", "__weakref__")
+
     def __init__(self, id: str, name: str):
         self.id: str = id
         self.name: str = name
@@ -18,6 +34,8 @@ NamedType = TypeVar("NamedType", bound=Named)
 class Updatable(ABC, Named):
     """Represents an object that can be updated from the API."""
 
+    __slots__ = ()
+
     @abstractmethod
     def update(self, update):
         pass
@@ -26,6 +44,8 @@ class Updatable(ABC, Named):
 class Controllable(Updatable):
     """Represents an object that can be controlled by the API."""
 
+    __slots__ = ()
+
     @abstractmethod
     async def up(self):
         pass
@@ -46,23 +66,30 @@ class Controllable(Updatable):
 class Motor(Controllable):
     """Represents a motor in the Gaposa API."""
 
+    __slots__ = ("status", "state", "running", "percent", "paused", "location", "icon")
+
     def update(self, info: Channel) -> "Motor":
-        self.name = info["Name"]
-        self.status = info["StatusCode"]
-        self.state = info["State"]
-        self.running = info["HomeRunning"]
-        self.percent = info["HomePercent"]
-        self.paused = info["HomePaused"]
-        self.location = info["Location"]
-        self.icon = info["Icon"]
+        (
+            self.name,
+            self.status,
+            self.state,
+            self.running,
+            self.percent,
+            self.paused,
+            self.location,
+            self.icon,
+        ) = MOTOR_FIELDS(info)
         return self
 
 
+EXPECTED_STATE = {
+    Command.UP: "UP",
+    Command.DOWN: "DOWN",
+    Command.STOP: "STOP",
+    Command.PRESET: "STOP",
+}
+
+
 def expectedState(command: Command) -> str:
     """Return the expected state of a motor after a command is issued."""
-    return {
-        Command.UP: "UP",
-        Command.DOWN: "DOWN",
-        Command.STOP: "STOP",
-        Command.PRESET: "STOP",
-    }[command]
+    return EXPECTED_STATE[command]
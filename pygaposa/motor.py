@@ -8,6 +8,8 @@ from pygaposa.model import Motor, Named, expectedState
 class MotorImpl(Motor):
     """Represents a motor in the Gaposa API."""
 
+    __slots__ = ("device",)
+
     def __init__(self, device: DeviceBase, id: str, info: Channel):
         Named.__init__(self, id, info["Name"])
         self.device = device
@@ -30,13 +32,16 @@ class MotorImpl(Motor):
         await self.command(Command.PRESET, waitForUpdate)
 
     async def command(self, command: Command, waitForUpdate=True):
-        await self.device.api.control(command, "channel", self.id)
+        await self.device.api.control(
+            command, "channel", self.id, serial=self.device.serial
+        )
         if waitForUpdate:
             await self.updateAfterCommand(command)
         else:
             asyncio.create_task(self.updateAfterCommand(command))
 
-    async def updateAfterCommand(self, command: Command, delay=2):
+    async def updateAfterCommand(self, command: Command, delay=0):
+        expected = expectedState(command)
         if delay:
             await asyncio.sleep(delay)
-        await self.device.update(lambda: self.state == expectedState(command))
+        await self.device.update(lambda: self.state == expected)
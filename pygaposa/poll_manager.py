@@ -1,15 +1,20 @@
 import asyncio
+import time
+from collections import deque
 from logging import Logger
+from statistics import median
 from typing import Any, Callable, Coroutine, Optional, TypedDict
 
 POLL_INTERVAL = 2  # seconds
 POLL_RETRIES = 10
 POLL_TIMEOUT = 20  # seconds
+POLL_FRESH_TTL = 0.5  # seconds
+SETTLE_HISTORY = 20  # number of settle times remembered
 
 
-class PollMagagerConfig(TypedDict):
+class PollMagagerConfigRequired(TypedDict):
     """
-    Configuration for PollManager.
+    Required configuration for PollManager.
     """
 
     """Interval between polls in seconds."""
@@ -22,6 +27,15 @@ class PollMagagerConfig(TypedDict):
     poll_timeout: int
 
 
+class PollMagagerConfig(PollMagagerConfigRequired, total=False):
+    """
+    Configuration for PollManager.
+    """
+
+    """Age in seconds below which a poll is fresh enough for a read-only update."""
+    poll_fresh_ttl: float
+
+
 DefaultPollManagerConfig: PollMagagerConfig = {
     "poll_interval": POLL_INTERVAL,
     "poll_retries": POLL_RETRIES,
@@ -41,7 +55,7 @@ class PollManager:
     The wait_for_update() method will perform the poll once. The wait_for_condition()
     method will perform the poll until the condition is met. The condition is a callback
     that returns True when the polling should stop. The condition is checked after each
-    poll.
+    poll, unless the poll returns False to indicate that the remote state is unchanged.
     """
 
     def __init__(
@@ -54,33 +68,55 @@ class PollManager:
         self.poll_interval = config["poll_interval"]
         self.poll_retries = config["poll_retries"]
         self.poll_timeout = config["poll_timeout"]
+        self.poll_fresh_ttl = config.get("poll_fresh_ttl", POLL_FRESH_TTL)
+        self.lastPoll: Optional[float] = None
         self.logger = logger
         self.pollingTask: Optional[asyncio.Task[Any]] = None
-        self.waiters: list[tuple[Optional[Callable[[], bool]], asyncio.Event]] = []
-
-    async def wait_for_update(self):
+        # Pending waiters, mapping each waiter's event to its condition and the
+        # time the condition was added
+        self.waiters: dict[
+            asyncio.Event, tuple[Optional[Callable[[], bool]], float]
+        ] = {}
+        self.wakeup: Optional[asyncio.Event] = None
+        self.settleTimes: deque[float] = deque(maxlen=SETTLE_HISTORY)
+
+    async def wait_for_update(self, allow_cached: bool = False):
         """
         Fetch the device document.
         """
-        await self.wait_for_condition()
+        await self.wait_for_condition(allow_cached=allow_cached)
 
     def add_condition(self, condition: Optional[Callable[[], bool]] = None):
         """
         Poll the device document until the callback returns True or just once.
         """
         event = asyncio.Event()
-        self.waiters.append((condition, event))
+        self.waiters[event] = (condition, time.monotonic())
         self.retries = 0
 
         if self.pollingTask is None:
             self.pollingTask = asyncio.create_task(self.execute())
+        elif self.wakeup is not None:
+            # Poll again straight away rather than waiting out the interval
+            self.wakeup.set()
 
         return event
 
-    async def wait_for_condition(self, condition: Optional[Callable[[], bool]] = None):
+    async def wait_for_condition(
+        self,
+        condition: Optional[Callable[[], bool]] = None,
+        allow_cached: bool = False,
+    ):
         """
         Poll the device document until the callback returns True or just once.
+
+        Callers that only read the state may pass allow_cached to return at once if
+        the condition already holds for the last polled state, or if there is no
+        condition and the last poll is still fresh. Waits after a command or write
+        must not, since that state may predate it, so they always poll at least once.
         """
+        if allow_cached and (self.isFresh() if condition is None else condition()):
+            return
         event = self.add_condition(condition)
         await event.wait()
 
@@ -88,42 +124,104 @@ class PollManager:
         """
         Poll the device document until all callbacks return True.
         """
+        lastPollStarted = float("-inf")
         while self.waiters:
             numConditions = self.numConditions()
+            changed: Optional[bool] = None
+            pollStarted = time.monotonic()
             try:
                 self.logger.debug(
                     f"Polling device document ({numConditions} conditions,"
                     f" {self.retries} retries)"
                 )
-                await asyncio.wait_for(self.poll(), self.poll_timeout)
+                changed = await asyncio.wait_for(self.poll(), self.poll_timeout)
+                self.lastPoll = time.monotonic()
             except asyncio.TimeoutError:
                 self.logger.error("Timeout waiting for device document update")
             except Exception:
                 self.logger.exception("Error waiting for device document update")
 
-            sleep = numConditions == self.numConditions()
+            # A waiter added during the poll may be for a write the poll predates,
+            # so it needs another poll, which follows straight away
+            sleep = all(started <= pollStarted for _, started in self.waiters.values())
 
+            # Conditions cannot have become true if the polled state is unchanged,
+            # but each is checked against at least the first poll after it was added
             met = [
-                (condition, event)
-                for condition, event in self.waiters
-                if condition is None or condition()
+                event
+                for event, (condition, started) in self.waiters.items()
+                if started <= pollStarted
+                and (
+                    condition is None
+                    or (
+                        (changed is not False or started > lastPollStarted)
+                        and condition()
+                    )
+                )
             ]
+            lastPollStarted = pollStarted
 
-            for condition, event in met:
+            now = time.monotonic()
+            for event in met:
+                condition, started = self.waiters.pop(event)
+                if condition is not None:
+                    self.settleTimes.append(now - started)
                 event.set()
-                self.waiters.remove((condition, event))
 
             if self.waiters and sleep:
                 self.retries += 1
                 if self.retries > self.poll_retries:
                     self.logger.error("Exceeded polling retries")
-                    for _, event in self.waiters:
+                    for event in self.waiters:
                         event.set()
-                    self.waiters = []
+                    self.waiters = {}
                 else:
-                    await asyncio.sleep(self.poll_interval)
+                    await self.sleep()
 
         self.pollingTask = None
 
+    async def sleep(self):
+        """
+        Wait until the next poll is due, or until a new condition is added.
+        """
+        # Only set while sleeping, so a condition added during a poll cannot leave
+        # a stale wakeup behind to cut the following sleep short
+        self.wakeup = asyncio.Event()
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), self.nextInterval())
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.wakeup = None
+
+    def nextInterval(self) -> float:
+        """
+        Return how long to wait before the next poll.
+
+        Polls are normally poll_interval apart, but the next poll is brought forward
+        to when the oldest pending condition reaches the median settle time observed
+        for earlier conditions, if that is sooner.
+        """
+        started = [
+            started
+            for condition, started in self.waiters.values()
+            if condition is not None
+        ]
+        if not self.settleTimes or not started:
+            return self.poll_interval
+        untilSettled = median(self.settleTimes) - (time.monotonic() - min(started))
+        if 0 < untilSettled < self.poll_interval:
+            return untilSettled
+        return self.poll_interval
+
+    def isFresh(self) -> bool:
+        """
+        Return whether the last successful poll is younger than poll_fresh_ttl.
+        """
+        return (
+            self.lastPoll is not None
+            and time.monotonic() - self.lastPoll < self.poll_fresh_ttl
+        )
+
     def numConditions(self):
-        return len([waiter for waiter in self.waiters if waiter[0] is not None])
+        return sum(1 for condition, _ in self.waiters.values() if condition is not None)
@@ -6,6 +6,8 @@ from pygaposa.model import Named, Updatable
 class Room(Updatable):
     """Represents a room in the Gaposa API."""
 
+    __slots__ = ("device", "favourite", "motors", "icon")
+
     def __init__(self, device: DeviceBase, id: str, info: RoomInfo):
         Named.__init__(self, id, info["Name"])
         self.device = device
@@ -1,5 +1,5 @@
-import asyncio
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Literal, Optional, Union
 
 import suncalc  # type: ignore
@@ -18,6 +18,20 @@ from pygaposa.model import Named, Updatable
 
 
 class ScheduleEvent:
+    __slots__ = (
+        "device",
+        "timezone",
+        "active",
+        "futureevent",
+        "submit",
+        "eventepoch",
+        "location",
+        "motors",
+        "eventmode",
+        "eventrepeat",
+        "__weakref__",
+    )
+
     def __init__(self, info: ScheduleEventInfo, device: DeviceBase):
         self.device = device
         self.update(info)
@@ -38,20 +52,44 @@ class ScheduleEvent:
 ScheduleEventsTuple = list[Optional[ScheduleEvent]]
 
 
+MODE_TO_INDEX = {
+    ScheduleEventType.UP: 0,
+    ScheduleEventType.DOWN: 1,
+    ScheduleEventType.PRESET: 2,
+}
+
+
 def modeToIndex(mode: ScheduleEventType) -> int:
-    return [
-        ScheduleEventType.UP,
-        ScheduleEventType.DOWN,
-        ScheduleEventType.PRESET,
-    ].index(mode)
+    return MODE_TO_INDEX[mode]
 
 
 EventDaysSpecifier = Union[EventDays, List[EventDays], EventRepeat]
 
+# Schedule attribute holding each ScheduleUpdate field, to confirm an update
+SCHEDULE_FIELDS = {
+    "Name": "name",
+    "Groups": "groups",
+    "Location": "location",
+    "Motors": "motorIds",
+    "Icon": "icon",
+    "Active": "active",
+}
+
 
 class Schedule(Updatable):
     """Represents a schedule in the Gaposa API."""
 
+    __slots__ = (
+        "device",
+        "events",
+        "groups",
+        "location",
+        "motorIds",
+        "motors",
+        "icon",
+        "active",
+    )
+
     def __init__(self, device: DeviceBase, id: str, info: ScheduleInfo):
         Named.__init__(self, id, info["Name"])
         self.device = device
@@ -62,7 +100,8 @@ class Schedule(Updatable):
         self.name = info["Name"]
         self.groups = info["Groups"]
         self.location = info["Location"]
-        self.motors = self.device.findMotorsById(info["Motors"])
+        self.motorIds: list[int] = list(info["Motors"])
+        self.motors = self.device.findMotorsById(self.motorIds)
         self.icon = info["Icon"]
         self.active = info["Active"]
         return self
@@ -74,27 +113,34 @@ class Schedule(Updatable):
         self.events = list(map(scheduleevent, infos))
 
     async def updateProperties(self, update: ScheduleUpdate):
-        update["Id"] = self.id
-        await self.device.api.updateSchedule(update)
-        await asyncio.sleep(2)
-        await self.device.update()
+        await self.device.api.updateSchedule(
+            update | {"Id": self.id}, serial=self.device.serial
+        )
+        await self.device.update(
+            lambda: all(
+                getattr(self, SCHEDULE_FIELDS[key]) == value
+                for key, value in update.items()
+                if key in SCHEDULE_FIELDS
+            )
+        )
 
     async def delete(self):
-        await self.device.api.deleteSchedule(self.id)
-        await asyncio.sleep(2)
+        await self.device.api.deleteSchedule(self.id, serial=self.device.serial)
         await self.device.update(lambda: not self.device.hasSchedule(self.id))
 
     async def setActive(self, Active: bool):
         await self.updateProperties({"Active": Active})
 
     async def setEvent(self, Mode: ScheduleEventType, event: ScheduleEventInfo):
-        await self.device.api.addScheduleEvent(self.id, Mode, event)
-        await asyncio.sleep(2)
+        await self.device.api.addScheduleEvent(
+            self.id, Mode, event, serial=self.device.serial
+        )
         await self.device.update(lambda: self.events[modeToIndex(Mode)] is not None)
 
     async def deleteEvent(self, Mode: ScheduleEventType):
-        await self.device.api.deleteScheduleEvent(self.id, Mode)
-        await asyncio.sleep(2)
+        await self.device.api.deleteScheduleEvent(
+            self.id, Mode, serial=self.device.serial
+        )
         await self.device.update(lambda: self.events[modeToIndex(Mode)] is None)
 
     async def setSunriseOpen(self, days: EventDaysSpecifier = EventDays.ALL):
@@ -109,6 +155,9 @@ class Schedule(Updatable):
         suntime: Literal["sunrise", "sunset"],
         days: EventDaysSpecifier = EventDays.ALL,
     ):
+        location, timezone = self.device.location, self.device.timezone
+        if location is None or timezone is None:
+            raise Exception("Device location is not known")
         mode: EventMode = {
             "SunRise": suntime == "sunrise",
             "SunSet": suntime == "sunset",
@@ -119,49 +168,59 @@ class Schedule(Updatable):
             {
                 "EventMode": mode,
                 "EventRepeat": getEventRepeat(days),
-                "TimeZone": self.device.timezone,
-                "Location": {
-                    "_latitude": self.device.location[0],
-                    "_longitude": self.device.location[1],
-                },
+                "TimeZone": timezone,
+                "Location": {"_latitude": location[0], "_longitude": location[1]},
                 "FutureEvent": False,
                 "Active": True,
                 "Submit": True,
-                "Motors": [int(motor.id) for motor in self.motors],
-                "EventEpoch": self.nextSuntimeEpoch("sunset"),
+                "Motors": self.motorIds,
+                "EventEpoch": self.nextSuntimeEpoch(suntime),
             },
         )
 
     def nextSuntimeEpoch(self, suntime: str):
         now = datetime.now()
-        todaysTimes: Dict[str, datetime] = suncalc.get_times(
-            now, self.device.location[0], self.device.location[1]
-        )  # type: ignore
-        if todaysTimes[suntime] < now:
-            tomorrow = self.getDateTomorrow()
-            tomorrowsTimes: Dict[str, datetime] = suncalc.get_times(
-                tomorrow, self.device.location[0], self.device.location[1]
-            )  # type: ignore
-            return int(tomorrowsTimes[suntime].timestamp())
-        else:
-            return int(todaysTimes[suntime].timestamp())
-
-    def getDateTomorrow(self):
-        return datetime.now() + timedelta(days=1)
+        today = now.toordinal()
+        if self.device.location is None:
+            raise Exception("Device location is not known")
+        latitude, longitude = self.device.location
+        time = getSuntimes(today, latitude, longitude)[suntime]
+        if time < now:
+            time = getSuntimes(today + 1, latitude, longitude)[suntime]
+        return int(time.timestamp())
+
+
+@lru_cache(maxsize=8)
+def getSuntimes(day: int, latitude: float, longitude: float) -> Dict[str, datetime]:
+    """Return the suncalc times for a day, given as a proleptic Gregorian ordinal.
+
+    The times only change once a day for a given location, so they are cached.
+    """
+    noon = datetime.fromordinal(day) + timedelta(hours=12)
+    return suncalc.get_times(noon, longitude, latitude)  # type: ignore
+
+
+ALL_DAYS: EventRepeat = (True, True, True, True, True, True, True)
+WEEKDAYS: EventRepeat = (True, True, True, True, True, False, False)
+WEEKENDS: EventRepeat = (False, False, False, False, False, True, True)
+EVENT_REPEATS: dict[EventDays, EventRepeat] = {
+    day: tuple(i == day for i in range(7))  # type: ignore
+    for day in EventDays
+    if day < EventDays.ALL
+} | {
+    EventDays.ALL: ALL_DAYS,
+    EventDays.WEEKDAYS: WEEKDAYS,
+    EventDays.WEEKENDS: WEEKENDS,
+}
 
 
 def getEventRepeat(days: EventDaysSpecifier) -> EventRepeat:
-    if isinstance(days, tuple) or isinstance(days, list):
+    if isinstance(days, (tuple, list)):
         if len(days) == 7 and all(isinstance(d, bool) for d in days):
             return tuple(days)  # type: ignore
         else:
             assert all(isinstance(d, EventDays) for d in days)
-            return tuple(x in days for x in range(7))  # type: ignore
-    elif days == EventDays.ALL:
-        return (True,) * len(EventDays)  # type: ignore
-    elif days == EventDays.WEEKDAYS:
-        return (True, True, True, True, True, False, False)
-    elif days == EventDays.WEEKENDS:
-        return (False, False, False, False, False, True, True)
+            daySet = set(days)
+            return tuple(x in daySet for x in range(7))  # type: ignore
     else:
-        return tuple(i == days for i in range(7))  # type: ignore
+        return EVENT_REPEATS[days]
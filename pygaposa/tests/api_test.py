@@ -1,5 +1,4 @@
-import json
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 
 import aiohttp
 import pytest
@@ -7,8 +6,9 @@ from aioresponses import CallbackResult, aioresponses
 from typeguard import TypeCheckError
 from yarl import URL
 
-from pygaposa.api import GaposaApi
+from pygaposa.api import GaposaApi, endpointUrls
 from pygaposa.api_types import Command, ScheduleEventType
+from pygaposa.json_utils import dumps, loads
 
 from .api_test_data import (
     add_schedule_update,
@@ -32,20 +32,7 @@ from .api_test_data import (
 
 
 @pytest.fixture
-def server():
-    with aioresponses() as server:
-        yield server
-
-
-@pytest.fixture
-async def websession():
-    session = aiohttp.ClientSession()
-    yield session
-    await session.close()
-
-
-@pytest.fixture
-async def api(websession: aiohttp.ClientSession):
+def api(websession: aiohttp.ClientSession):
     async def getToken():
         return "mock_token"
 
@@ -53,7 +40,7 @@ async def api(websession: aiohttp.ClientSession):
 
 
 @pytest.fixture
-async def api_bad_auth(api: GaposaApi):
+def api_bad_auth(api: GaposaApi):
     async def getToken():
         return "bad_mock_token"
 
@@ -62,58 +49,53 @@ async def api_bad_auth(api: GaposaApi):
 
 
 @pytest.fixture
-async def api_set_client(api: GaposaApi):
+def api_set_client(api: GaposaApi):
     api.setClientAndRole("mock_client_id", 1)
     return api
 
 
 @pytest.fixture
-async def api_set_bad_client(api: GaposaApi):
+def api_set_bad_client(api: GaposaApi):
     api.setClientAndRole("bad_mock_client_id", 1)
     return api
 
 
 @pytest.fixture
-async def api_set_serial(api: GaposaApi):
+def api_set_serial(api: GaposaApi):
     api.setSerial("mock_serial")
     return api
 
 
-def authorize(url: URL, **kwargs: Dict[str, Any]):
-    if "headers" in kwargs:
-        headers: Optional[Dict[str, str]] = kwargs["headers"]
-        if headers and "authorization" in headers:
-            if headers["authorization"] == "Bearer mock_token":
-                if url.path.startswith("/v1/login"):
-                    return None
-                else:
-                    if "auth" in headers:
-                        auth: Dict[str, Any] = json.loads(headers["auth"])
-                        if "role" in auth and "client" in auth:
-                            if auth["role"] == 1 and auth["client"] == "mock_client_id":
-                                return None
-
-    return CallbackResult(status=403, reason="Forbidden")
-
+AUTHORIZATION = "Bearer mock_token"
+AUTH = dumps({"role": 1, "client": "mock_client_id"}).decode()
+FORBIDDEN = CallbackResult(status=403, reason="Forbidden")
+BAD_REQUEST = CallbackResult(status=402, reason="Bad Request")
 
-def mock_get(server: aioresponses, path: str, payload: Any):
-    url = GaposaApi.serverUrl + path
-    server.get(url, payload=payload, callback=authorize)
 
+def authorize(url: URL, **kwargs: Dict[str, Any]):
+    headers: Dict[str, str] = kwargs.get("headers") or {}
+    if headers.get("authorization") == AUTHORIZATION:
+        if url.path.startswith("/v1/login") or headers.get("auth") == AUTH:
+            return None
 
-def mock_post(server: aioresponses, path: str, payload, validate: Callable):
-    url = GaposaApi.serverUrl + path
-    server.post(url, payload=payload, callback=make_callback(validate))
+    return FORBIDDEN
 
 
-def mock_put(server: aioresponses, path: str, payload, validate: Callable):
-    url = GaposaApi.serverUrl + path
-    server.put(url, payload=payload, callback=make_callback(validate))
+URLS = endpointUrls(GaposaApi.serverUrl)
 
 
-def mock_delete(server: aioresponses, path: str, payload, validate: Callable):
-    url = GaposaApi.serverUrl + path
-    server.delete(url, payload=payload, callback=make_callback(validate))
+def mock_endpoint(
+    server: aioresponses,
+    method: str,
+    path: str,
+    payload: Any,
+    expected: Optional[Dict[str, Any]] = None,
+):
+    if expected is None:
+        callback: Callable = authorize
+    else:
+        callback = make_callback(validator({"payload": expected}))
+    server.add(URLS[path], method, payload=payload, callback=callback)
 
 
 def make_callback(validate: Callable):
@@ -124,9 +106,9 @@ def make_callback(validate: Callable):
         if "data" in kwargs:
             data = kwargs["data"]
             if data:
-                data = json.loads(data) if isinstance(data, str) else data
+                data = loads(data) if isinstance(data, (str, bytes)) else data
                 return validate(data)
-        return CallbackResult(status=402, reason="Bad Request")
+        return BAD_REQUEST
 
     return callback
 
@@ -134,299 +116,206 @@ def make_callback(validate: Callable):
 def validator(expected: Dict[str, Any]):
     def validate(data: Dict[str, Any]):
         if data != expected:
-            return CallbackResult(status=402, reason="Bad Request")
+            return BAD_REQUEST
 
     return validate
 
 
-async def assert_forbidden(api_function: Callable):
-    await assert_http_failure(api_function, 403, "Forbidden")
-
-
-async def assert_bad_request(api_function: Callable):
-    await assert_http_failure(api_function, 402, "Bad Request")
-
-
-async def assert_http_failure(api_function: Callable, status: int, message: str):
-    try:
-        await api_function()
-        raise AssertionError("Expected exception")
-    except aiohttp.ClientResponseError as e:
-        assert e.status == status
-        assert e.message == message
-
-
-async def assert_bad_response(api_function: Callable, msg: str):
-    try:
-        await api_function()
-        raise AssertionError("Expected exception")
-    except TypeCheckError as e:
-        assert e.args[0] == msg
-
-
-async def test_login(server, api):
-    mock_get(server, "/v1/login", expected_login_response)
-    response = await api.login()
-    assert response == expected_login_response
-    server.assert_called_once()
-
-
-async def test_login_auth_failure(server, api, api_bad_auth):
-    mock_get(server, "/v1/login", expected_login_response)
-    await assert_forbidden(api.login)
-    server.assert_called_once()
-
-
-async def test_login_bad_response(server, api):
-    mock_get(server, "/v1/login", {"apiStatus": "Failed"})
-    await assert_bad_response(api.login, 'is missing required key(s): "msg", "result"')
-    server.assert_called_once()
-
-
-async def test_users(server, api, api_set_client):
-    mock_get(server, "/v1/users", expected_users_response)
-    response = await api.users()
-    assert response == expected_users_response
-    server.assert_called_once()
-
-
-async def test_users_auth_failure(server, api, api_set_client, api_bad_auth):
-    mock_get(server, "/v1/users", expected_users_response)
-    await assert_forbidden(api.users)
-    server.assert_called_once()
-
-
-async def test_users_client_auth_failure(server, api, api_set_bad_client):
-    mock_get(server, "/v1/users", expected_users_response)
-    await assert_forbidden(api.users)
-    server.assert_called_once()
-
-
-async def test_users_bad_response(server, api, api_set_client):
-    mock_get(server, "/v1/users", {"apiStatus": "Failed"})
-    await assert_bad_response(api.users, 'is missing required key(s): "msg", "result"')
-    server.assert_called_once()
-
-
-@pytest.mark.parametrize(
-    "scope, expected_request",
-    [
-        ["channel", expected_control_request_channel],
-        ["group", expected_control_request_group],
-    ],
-)
-async def test_control(
-    scope, expected_request, server, api, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_request})
-    mock_post(server, "/v1/control", expected_control_response, validate)
-    response = await api.control(Command.DOWN, scope, "1")
-    assert response == expected_control_response
-    server.assert_called_once()
-
-
-async def test_control_bad_request(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_control_request_channel})
-    mock_post(server, "/v1/control", expected_control_response, validate)
-
-    def control():
-        return api.control(Command.DOWN, "room", "1")
-
-    await assert_bad_request(control)
-    server.assert_called_once()
-
-
-async def test_control_auth_failure(
-    server, api, api_bad_auth, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_control_request_channel})
-    mock_post(server, "/v1/control", expected_control_response, validate)
-
-    def control():
-        return api.control(Command.DOWN, "channel", "1")
-
-    await assert_forbidden(control)
-    server.assert_called_once()
-
-
-async def test_control_bad_response(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_control_request_channel})
-    mock_post(server, "/v1/control", {"apiCommand": "Failed"}, validate)
-
-    def control():
-        return api.control(Command.DOWN, "channel", "1")
-
-    await assert_bad_response(control, 'is missing required key(s): "msg", "result"')
-    server.assert_called_once()
-
-
-async def test_add_schedule(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_add_schedule_request})
-    mock_post(server, "/v1/schedules", expected_add_schedule_response, validate)
-    response = await api.addSchedule(add_schedule_update)
-    assert response == expected_add_schedule_response
-    server.assert_called_once()
-
-
-async def test_add_schedule_auth_failure(
-    server, api, api_bad_auth, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_add_schedule_request})
-    mock_post(server, "/v1/schedules", expected_add_schedule_response, validate)
-
-    def schedule():
-        return api.addSchedule(add_schedule_update)
-
-    await assert_forbidden(schedule)
-    server.assert_called_once()
-
-
-async def test_add_schedule_bad_response(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_add_schedule_request})
-    mock_post(server, "/v1/schedules", {"apiStatus": "Failed"}, validate)
-
-    def schedule():
-        return api.addSchedule(add_schedule_update)
-
-    await assert_bad_response(schedule, 'is missing required key(s): "msg", "result"')
-    server.assert_called_once()
-
-
-async def test_update_schedule(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_update_schedule_request})
-    mock_put(server, "/v1/schedules", expected_update_schedule_response, validate)
-    response = await api.updateSchedule(update_schedule_update)
-    assert response == expected_update_schedule_response
-    server.assert_called_once()
-
-
-async def test_update_schedule_auth_failure(
-    server, api, api_bad_auth, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_update_schedule_request})
-    mock_put(server, "/v1/schedules", expected_update_schedule_response, validate)
-
-    def schedule():
-        return api.updateSchedule(update_schedule_update)
-
-    await assert_forbidden(schedule)
-    server.assert_called_once()
-
-
-async def test_update_schedule_bad_response(
-    server, api, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_update_schedule_request})
-    mock_put(server, "/v1/schedules", {"apiStatus": "Failed"}, validate)
-
-    def schedule():
-        return api.updateSchedule(update_schedule_update)
-
-    await assert_bad_response(schedule, 'is missing required key(s): "msg", "result"')
-    server.assert_called_once()
-
-
-async def test_delete_schedule(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_delete_schedule_request})
-    mock_delete(server, "/v1/schedules", expected_delete_schedule_response, validate)
-    response = await api.deleteSchedule("1")
-    assert response == expected_delete_schedule_response
-    server.assert_called_once()
-
-
-async def test_delete_schedule_auth_failure(
-    server, api, api_bad_auth, api_set_client, api_set_serial
+async def assert_fails(api_function: Callable, expected: Union[CallbackResult, str]):
+    """Assert that the call fails with the mocked HTTP error or type error."""
+    if isinstance(expected, str):
+        with pytest.raises(TypeCheckError) as typeError:
+            await api_function()
+        assert typeError.value.args[0] == expected
+    else:
+        with pytest.raises(aiohttp.ClientResponseError) as httpError:
+            await api_function()
+        assert httpError.value.status == expected.status
+        assert httpError.value.message == expected.reason
+
+
+ENDPOINT_CASES = [
+    pytest.param(
+        GaposaApi.login,
+        (),
+        "GET",
+        "/v1/login",
+        None,
+        expected_login_response,
+        id="login",
+    ),
+    pytest.param(
+        GaposaApi.users,
+        (),
+        "GET",
+        "/v1/users",
+        None,
+        expected_users_response,
+        id="users",
+    ),
+    pytest.param(
+        GaposaApi.control,
+        (Command.DOWN, "channel", "1"),
+        "POST",
+        "/v1/control",
+        expected_control_request_channel,
+        expected_control_response,
+        id="control",
+    ),
+    pytest.param(
+        GaposaApi.addSchedule,
+        (add_schedule_update,),
+        "POST",
+        "/v1/schedules",
+        expected_add_schedule_request,
+        expected_add_schedule_response,
+        id="addSchedule",
+    ),
+    pytest.param(
+        GaposaApi.updateSchedule,
+        (update_schedule_update,),
+        "PUT",
+        "/v1/schedules",
+        expected_update_schedule_request,
+        expected_update_schedule_response,
+        id="updateSchedule",
+    ),
+    pytest.param(
+        GaposaApi.deleteSchedule,
+        ("1",),
+        "DELETE",
+        "/v1/schedules",
+        expected_delete_schedule_request,
+        expected_delete_schedule_response,
+        id="deleteSchedule",
+    ),
+    pytest.param(
+        GaposaApi.addScheduleEvent,
+        ("1", ScheduleEventType.UP, schedule_event),
+        "PUT",
+        "/v1/schedules/event",
+        expected_schedule_event_request,
+        expected_schedule_event_response,
+        id="addScheduleEvent",
+    ),
+    pytest.param(
+        GaposaApi.deleteScheduleEvent,
+        ("1", ScheduleEventType.UP),
+        "DELETE",
+        "/v1/schedules/event",
+        expected_delete_schedule_event_request,
+        expected_schedule_event_response,
+        id="deleteScheduleEvent",
+    ),
+]
+
+ENDPOINT_PARAMS = "api_method, args, method, path, expected_request, expected_response"
+
+
+@pytest.mark.parametrize(ENDPOINT_PARAMS, ENDPOINT_CASES)
+async def test_endpoint(
+    api_method,
+    args,
+    method,
+    path,
+    expected_request,
+    expected_response,
+    server,
+    api,
+    api_set_client,
+    api_set_serial,
 ):
-    validate = validator({"payload": expected_delete_schedule_request})
-    mock_delete(server, "/v1/schedules", expected_delete_schedule_response, validate)
-
-    def schedule():
-        return api.deleteSchedule("1")
-
-    await assert_forbidden(schedule)
+    mock_endpoint(server, method, path, expected_response, expected_request)
+    response = await api_method(api, *args)
+    assert response == expected_response
     server.assert_called_once()
 
 
-async def test_delete_schedule_bad_response(
-    server, api, api_set_client, api_set_serial
+@pytest.mark.parametrize(ENDPOINT_PARAMS, ENDPOINT_CASES)
+async def test_endpoint_auth_failure(
+    api_method,
+    args,
+    method,
+    path,
+    expected_request,
+    expected_response,
+    server,
+    api,
+    api_bad_auth,
+    api_set_client,
+    api_set_serial,
 ):
-    validate = validator({"payload": expected_delete_schedule_request})
-    mock_delete(server, "/v1/schedules", {"apiStatus": "Failed"}, validate)
-
-    def schedule():
-        return api.deleteSchedule("1")
-
-    await assert_bad_response(schedule, 'is missing required key(s): "msg", "result"')
-    server.assert_called_once()
-
-
-async def test_add_schedule_event(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_schedule_event_request})
-    mock_put(server, "/v1/schedules/event", expected_schedule_event_response, validate)
-    response = await api.addScheduleEvent("1", ScheduleEventType.UP, schedule_event)
-    assert response == expected_schedule_event_response
+    mock_endpoint(server, method, path, expected_response, expected_request)
+    await assert_fails(lambda: api_method(api, *args), FORBIDDEN)
     server.assert_called_once()
 
 
-async def test_add_schedule_event_auth_failure(
-    server, api, api_bad_auth, api_set_client, api_set_serial
+@pytest.mark.parametrize(ENDPOINT_PARAMS, ENDPOINT_CASES)
+async def test_endpoint_bad_response(
+    api_method,
+    args,
+    method,
+    path,
+    expected_request,
+    expected_response,
+    server,
+    api,
+    api_set_client,
+    api_set_serial,
 ):
-    validate = validator({"payload": expected_schedule_event_request})
-    mock_put(server, "/v1/schedules/event", expected_schedule_event_response, validate)
-
-    def schedule():
-        return api.addScheduleEvent("1", ScheduleEventType.UP, schedule_event)
-
-    await assert_forbidden(schedule)
+    # Keep only the leading status key so that "msg" and "result" are missing
+    failed = {next(iter(expected_response)): "Failed"}
+    mock_endpoint(server, method, path, failed, expected_request)
+    await assert_fails(
+        lambda: api_method(api, *args),
+        'is missing required key(s): "msg", "result"',
+    )
     server.assert_called_once()
 
 
-async def test_add_schedule_event_bad_response(
-    server, api, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_schedule_event_request})
-    mock_put(server, "/v1/schedules/event", {"apiStatus": "Failed"}, validate)
-
-    def schedule():
-        return api.addScheduleEvent("1", ScheduleEventType.UP, schedule_event)
-
-    await assert_bad_response(schedule, 'is missing required key(s): "msg", "result"')
+async def test_users_client_auth_failure(server, api, api_set_bad_client):
+    mock_endpoint(server, "GET", "/v1/users", expected_users_response)
+    await assert_fails(api.users, FORBIDDEN)
     server.assert_called_once()
 
 
-async def test_delete_schedule_event(server, api, api_set_client, api_set_serial):
-    validate = validator({"payload": expected_delete_schedule_event_request})
-    mock_delete(
-        server, "/v1/schedules/event", expected_schedule_event_response, validate
+async def test_control_group(server, api, api_set_client, api_set_serial):
+    mock_endpoint(
+        server,
+        "POST",
+        "/v1/control",
+        expected_control_response,
+        expected_control_request_group,
     )
-    response = await api.deleteScheduleEvent("1", ScheduleEventType.UP)
-    assert response == expected_schedule_event_response
+    response = await api.control(Command.DOWN, "group", "1")
+    assert response == expected_control_response
     server.assert_called_once()
 
 
-async def test_delete_schedule_event_auth_failure(
-    server, api, api_bad_auth, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_delete_schedule_event_request})
-    mock_delete(
-        server, "/v1/schedules/event", expected_schedule_event_response, validate
+async def test_control_serial(server, api, api_set_client):
+    mock_endpoint(
+        server,
+        "POST",
+        "/v1/control",
+        expected_control_response,
+        expected_control_request_channel,
     )
-
-    def schedule():
-        return api.deleteScheduleEvent("1", ScheduleEventType.UP)
-
-    await assert_forbidden(schedule)
+    response = await api.control(Command.DOWN, "channel", "1", serial="mock_serial")
+    assert response == expected_control_response
     server.assert_called_once()
 
 
-async def test_delete_schedule_event_bad_response(
-    server, api, api_set_client, api_set_serial
-):
-    validate = validator({"payload": expected_delete_schedule_event_request})
-    mock_delete(server, "/v1/schedules/event", {"apiStatus": "Failed"}, validate)
+async def test_control_bad_request(server, api, api_set_client, api_set_serial):
+    mock_endpoint(
+        server,
+        "POST",
+        "/v1/control",
+        expected_control_response,
+        expected_control_request_channel,
+    )
 
-    def schedule():
-        return api.deleteScheduleEvent("1", ScheduleEventType.UP)
+    def control():
+        return api.control(Command.DOWN, "room", "1")
 
-    await assert_bad_response(schedule, 'is missing required key(s): "msg", "result"')
+    await assert_fails(control, BAD_REQUEST)
     server.assert_called_once()
@@ -0,0 +1,58 @@
+from typing import Dict
+from unittest.mock import Mock
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aioresponses import aioresponses
+from pytest_asyncio import is_async_test
+
+from pygaposa.api import GaposaApi
+from pygaposa.devicebase import DeviceBase
+from pygaposa.model import Motor
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session event loop."""
+    sessionLoop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(sessionLoop, append=False)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def websession():
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+@pytest.fixture(scope="module")
+def mockServer():
+    with aioresponses() as server:
+        yield server
+
+
+@pytest.fixture
+def server(mockServer: aioresponses):
+    """Mocked HTTP server, patched once per module and cleared after each test."""
+    yield mockServer
+    mockServer.clear()
+    mockServer.requests.clear()
+
+
+@pytest.fixture
+def motors() -> Dict[int, Motor]:
+    """Motor mocks, looked up by id through the mocked device."""
+    return {id: Mock() for id in range(1, 7)}
+
+
+@pytest.fixture
+def device(motors: Dict[int, Motor]) -> Mock:
+    """Device mock with a mocked API, resolving motor ids from the motors fixture."""
+    device = Mock(spec=DeviceBase)
+    device.api = Mock(spec=GaposaApi)
+    device.serial = "mock_serial"
+    getMotor = motors.__getitem__
+    device.findMotorsById.side_effect = lambda ids: list(map(getMotor, ids))
+    return device
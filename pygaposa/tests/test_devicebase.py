@@ -0,0 +1,202 @@
+import logging
+from typing import Any, Dict
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+from typeguard import TypeCheckError
+from yarl import URL
+
+from pygaposa.api import GaposaApi
+from pygaposa.devicebase import DeviceBase
+from pygaposa.firebase import FirebaseApp, FirestorePath
+from pygaposa.poll_manager import DefaultPollManagerConfig
+
+DOCUMENTS = "/projects/mock/databases/default/documents"
+DEVICE_URL = "https://firestore.googleapis.com/v1" + DOCUMENTS + "/Devices/mock_serial"
+SCHEDULE_URL = DEVICE_URL + "/Schedule"
+
+
+def toValue(value: Any) -> Dict:
+    """Encode a native Python value as a Firestore value."""
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": {k: toValue(v) for k, v in value.items()}}}
+    elif isinstance(value, list):
+        return {"arrayValue": {"values": [toValue(v) for v in value]}}
+    elif isinstance(value, bool):
+        return {"booleanValue": value}
+    elif isinstance(value, int):
+        return {"integerValue": str(value)}
+    elif value is None:
+        return {"nullValue": None}
+    return {"stringValue": value}
+
+
+def mock_device_document(updateTime: str, **fields) -> Dict:
+    document = {
+        "State": {"OnLine": True},
+        "Info": {"Name": "mock_device"},
+        "Assistant": {},
+        "HeartBeat": {},
+        "Uid": [],
+        "Channels": {},
+        "Rooms": {},
+        "Groups": {},
+        "DeletedChannels": [],
+        "Pending": [],
+        **fields,
+    }
+    return {
+        "name": DOCUMENTS[1:] + "/Devices/mock_serial",
+        "fields": toValue(document)["mapValue"]["fields"],
+        "createTime": "mock_create_time",
+        "updateTime": updateTime,
+    }
+
+
+@pytest.fixture
+def mock_app(websession):
+    app = MagicMock(spec=FirebaseApp)()
+    app.firebaseAuth.getToken = AsyncMock(return_value="mock_token")
+    app.session = websession
+    return app
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger(__name__)
+    yield logger
+    logger.setLevel(logging.NOTSET)
+
+
+@pytest.fixture
+def device(mock_app, logger):
+    return DeviceBase(
+        Mock(spec=GaposaApi),
+        FirestorePath(mock_app, None, DOCUMENTS),
+        logger,
+        DefaultPollManagerConfig,
+        {"Serial": "mock_serial", "Name": "mock_device"},  # type: ignore
+    )
+
+
+async def test_do_update_skips_unchanged_document(server, device):
+    server.get(DEVICE_URL, payload=mock_device_document("t1"), repeat=True)
+
+    assert await device.doUpdate()
+    document = device.document
+    assert device.documentUpdateTime == "t1"
+    assert device.state == {"OnLine": True}
+
+    assert not await device.doUpdate()
+    assert device.document is document
+
+
+async def test_do_update_retries_invalid_document(server, device, logger):
+    server.get(DEVICE_URL, payload=mock_device_document("t1"))
+    assert await device.doUpdate()
+    document = device.document
+
+    # The second version fails validation, so it must not be taken as processed
+    logger.setLevel(logging.DEBUG)
+    server.get(DEVICE_URL, payload=mock_device_document("t2"), repeat=True)
+    for _ in range(2):
+        with pytest.raises(TypeCheckError):
+            await device.doUpdate()
+        assert device.document is document
+        assert device.documentUpdateTime == "t1"
+
+
+async def test_do_update_rejects_document_missing_keys(server, device):
+    document = mock_device_document("t1")
+    del document["fields"]["State"]
+    server.get(DEVICE_URL, payload=document)
+
+    # Checked even when the full validation is off
+    with pytest.raises(TypeCheckError, match=r"missing required key\(s\): State"):
+        await device.doUpdate()
+    assert device.documentUpdateTime is None
+
+
+def mock_event_document(id: str, **fields) -> Dict:
+    return {
+        "name": DOCUMENTS[1:] + "/Devices/mock_serial/Schedule/" + id,
+        "fields": toValue({"EventEpoch": 1, **fields})["mapValue"]["fields"],
+        "createTime": "mock_create_time",
+        "updateTime": "mock_update_time",
+    }
+
+
+async def test_do_update_lists_schedule_events(server, device):
+    server.get(
+        DEVICE_URL,
+        payload=mock_device_document("t1", Schedule={"1": {}, "2": {}}),
+    )
+    server.get(
+        SCHEDULE_URL + "?pageSize=300",
+        payload={
+            "documents": [mock_event_document("1.UP"), mock_event_document("2.DOWN")],
+            "nextPageToken": "mock_page_token",
+        },
+    )
+    server.get(
+        SCHEDULE_URL + "?pageSize=300&pageToken=mock_page_token",
+        payload={"documents": [mock_event_document("1.PRESET", EventEpoch=2)]},
+    )
+
+    assert await device.doUpdate()
+    assert device.scheduleEvents == {
+        "1": [{"EventEpoch": 1}, None, {"EventEpoch": 2}],
+        "2": [None, {"EventEpoch": 1}, None],
+    }
+
+
+async def test_do_update_gets_schedule_events_when_listing_forbidden(server, device):
+    server.get(
+        DEVICE_URL,
+        payload=mock_device_document("t1", Schedule={"1": {}}),
+        repeat=True,
+    )
+    server.get(SCHEDULE_URL + "?pageSize=300", status=403)
+    server.get(SCHEDULE_URL + "/1.UP", payload=mock_event_document("1.UP"))
+    server.get(SCHEDULE_URL + "/1.DOWN", status=404, repeat=True)
+    server.get(SCHEDULE_URL + "/1.PRESET", status=404, repeat=True)
+
+    assert await device.doUpdate()
+    assert device.scheduleEvents == {"1": [{"EventEpoch": 1}, None, None]}
+
+    # The listing is not retried once it has been refused
+    server.get(SCHEDULE_URL + "/1.UP", status=404)
+    assert await device.doUpdate()
+    assert device.scheduleEvents == {"1": [None, None, None]}
+
+
+async def test_do_update_reports_schedule_event_changes(server, device):
+    server.get(
+        DEVICE_URL,
+        payload=mock_device_document("t1", Schedule={"1": {}}),
+        repeat=True,
+    )
+    for epoch in (1, 1, 2):
+        server.get(
+            SCHEDULE_URL + "?pageSize=300",
+            payload={"documents": [mock_event_document("1.UP", EventEpoch=epoch)]},
+        )
+
+    assert await device.doUpdate()
+    assert not await device.doUpdate()
+    assert await device.doUpdate()
+    assert device.scheduleEvents == {"1": [{"EventEpoch": 2}, None, None]}
+
+
+async def test_update_skips_conditions_when_unchanged(server, device):
+    server.get(DEVICE_URL, payload=mock_device_document("t1"), repeat=True)
+    assert await device.doUpdate()
+
+    device.pollManager.poll_interval = 0
+    device.pollManager.poll_retries = 2
+    condition = Mock(return_value=False)
+    await device.update(condition)
+
+    # Checked against the first poll, but not after the unchanged ones
+    condition.assert_called_once()
+    assert len(server.requests[("GET", URL(DEVICE_URL))]) == 4
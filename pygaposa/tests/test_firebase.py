@@ -1,4 +1,5 @@
 import asyncio
+from datetime import datetime
 from unittest import mock
 
 import aiohttp
@@ -61,3 +62,21 @@ def test_initialize_app(mock_firebase_app):
 
     assert firebase_app == "firebase_app"
     mock_firebase_app.assert_called_once_with(firebase_config, loop, websession)
+
+
+async def test_get_token_refreshes_once():
+    firebase_config: FirebaseConfig = {}  # type: ignore
+    firebase_auth = FirebaseApp(firebase_config).auth()
+    firebase_auth.authresponse = {"idToken": "token"}  # type: ignore
+
+    async def refresh_id_token():
+        await asyncio.sleep(0)
+        firebase_auth.token_expiry = datetime.max
+
+    with mock.patch.object(
+        firebase_auth, "refresh_id_token", side_effect=refresh_id_token
+    ) as mock_refresh:
+        tokens = await asyncio.gather(*(firebase_auth.getToken() for _ in range(3)))
+
+    assert tokens == ["token"] * 3
+    mock_refresh.assert_called_once()
@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import aiohttp
 import pytest
-from aioresponses import CallbackResult, aioresponses
+from aioresponses import CallbackResult
 
 from pygaposa.firebase import FirebaseApp, Firestore, FirestoreDocumentType
 
@@ -19,19 +19,6 @@ mock_document: FirestoreDocumentType = {
 }
 
 
-@pytest.fixture
-def server():
-    with aioresponses() as server:
-        yield server
-
-
-@pytest.fixture
-async def websession():
-    session = aiohttp.ClientSession()
-    yield session
-    await session.close()
-
-
 @pytest.fixture
 def mock_app(websession):
     app = MagicMock(spec=FirebaseApp)()
@@ -57,22 +44,23 @@ def authorize(url, **kwargs):
     return CallbackResult(status=403, reason="Forbidden")
 
 
-@pytest.mark.asyncio
-async def test_get_with_success_response(server, mock_app):
+@pytest.mark.parametrize(
+    "payload", [mock_document, None], ids=["document", "no_document"]
+)
+async def test_get(server, mock_app, payload):
     server.get(
         "https://firestore.googleapis.com/v1/test/path",
-        payload=mock_document,
+        payload=payload,
         callback=authorize,
     )
 
     firestore = Firestore(app=mock_app)
     document = await firestore._get("/test/path")
 
-    assert document == mock_document
+    assert document == payload
     server.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_get_with_auth_failure(server, mock_app_bad_auth):
     server.get(
         "https://firestore.googleapis.com/v1/test/path",
@@ -91,16 +79,33 @@ async def test_get_with_auth_failure(server, mock_app_bad_auth):
     server.assert_called_once()
 
 
-@pytest.mark.asyncio
-async def test_get_with_no_document(server, mock_app):
+async def test_list_follows_pages(server, mock_app):
+    url = "https://firestore.googleapis.com/v1/test/collection?pageSize=300"
     server.get(
-        "https://firestore.googleapis.com/v1/test/path",
-        payload=None,
+        url,
+        payload={"documents": [mock_document], "nextPageToken": "next"},
+        callback=authorize,
+    )
+    server.get(
+        url + "&pageToken=next",
+        payload={"documents": [mock_document]},
         callback=authorize,
     )
 
     firestore = Firestore(app=mock_app)
-    document = await firestore._get("/test/path")
+    documents = await firestore.list("/test/collection")
 
-    assert document is None
-    server.assert_called_once()
+    assert [document.document for document in documents] == [mock_document] * 2
+
+
+async def test_list_with_empty_collection(server, mock_app):
+    server.get(
+        "https://firestore.googleapis.com/v1/test/collection?pageSize=300",
+        payload={},
+        callback=authorize,
+    )
+
+    firestore = Firestore(app=mock_app)
+    documents = await firestore.list("/test/collection")
+
+    assert documents == []
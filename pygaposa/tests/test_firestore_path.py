@@ -5,9 +5,17 @@ import pytest
 from pygaposa.firebase import FirebaseApp, Firestore, FirestorePath, pathjoin
 
 
-def test_init():
-    app = mock.MagicMock(spec=FirebaseApp)
-    firestore = mock.MagicMock(spec=Firestore)
+@pytest.fixture
+def app():
+    return mock.MagicMock(spec=FirebaseApp)
+
+
+@pytest.fixture
+def firestore():
+    return mock.MagicMock(spec=Firestore)
+
+
+def test_init(app, firestore):
     path = "test/path"
 
     fp = FirestorePath(app, firestore, path)
@@ -17,9 +25,7 @@ def test_init():
     assert fp.path == path
 
 
-def test_child():
-    app = mock.MagicMock(spec=FirebaseApp)
-    firestore = mock.MagicMock(spec=Firestore)
+def test_child(app, firestore):
     path = "parent/path"
     child_path = "child/path"
 
@@ -30,8 +36,7 @@ def test_child():
     assert fp_child.path == f"{path}/{child_path}"
 
 
-def test_sanitize_path():
-    app = mock.MagicMock(spec=FirebaseApp)
+def test_sanitize_path(app):
     path = "unsanitized/path/"
 
     fp = FirestorePath(app, None, path)
@@ -40,10 +45,7 @@ def test_sanitize_path():
     assert fp.path == path[:-1]  # ensure trailing '/' is removed
 
 
-@pytest.mark.asyncio
-async def test_get():
-    app = mock.MagicMock(spec=FirebaseApp)
-    firestore = mock.MagicMock(spec=Firestore)
+async def test_get(app, firestore):
     path = "get/path"
 
     fp = FirestorePath(app, firestore, path)
@@ -53,6 +55,15 @@ async def test_get():
     firestore.get.assert_called_once_with(path)
 
 
+async def test_list(app, firestore):
+    path = "list/path"
+
+    fp = FirestorePath(app, firestore, path)
+    await fp.list()
+
+    firestore.list.assert_called_once_with(path)
+
+
 def test_pathjoin_without_slash():
     base = "base"
     path = "path"
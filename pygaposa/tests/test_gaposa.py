@@ -0,0 +1,97 @@
+import re
+
+import pytest
+
+from pygaposa.api import GaposaApi
+from pygaposa.firebase import FirebaseAuthException
+from pygaposa.gaposa import Gaposa
+
+from .api_test_data import expected_login_response, expected_users_response
+
+SIGN_IN_URL = re.compile(
+    r"^https://identitytoolkit\.googleapis\.com/v1/accounts:signInWithPassword"
+)
+GEOCODE_URL = re.compile(r"^https://maps\.googleapis\.com/maps/api/geocode/json")
+TIMEZONE_URL = re.compile(r"^https://maps\.googleapis\.com/maps/api/timezone/json")
+
+mock_sign_in_response = {
+    "kind": "identitytoolkit#VerifyPasswordResponse",
+    "localId": "mock_local_id",
+    "email": "mock_email",
+    "displayName": "",
+    "idToken": "mock_token",
+    "registered": True,
+    "refreshToken": "mock_refresh_token",
+    "expiresIn": "3600",
+}
+
+mock_geocode_response = {
+    "status": "OK",
+    "results": [{"geometry": {"location": {"lat": 51.5, "lng": -0.1}}}],
+}
+
+mock_timezone_response = {
+    "dstOffset": 0,
+    "rawOffset": 0,
+    "status": "OK",
+    "timeZoneId": "Europe/London",
+    "timeZoneName": "Greenwich Mean Time",
+}
+
+
+def mock_login(server, repeat=False):
+    server.post(SIGN_IN_URL, payload=mock_sign_in_response, repeat=repeat)
+    server.get(
+        GaposaApi.serverUrl + "/v1/login",
+        payload=expected_login_response,
+        repeat=repeat,
+    )
+    server.get(
+        GaposaApi.serverUrl + "/v1/users",
+        payload=expected_users_response,
+        repeat=repeat,
+    )
+    server.get(GEOCODE_URL, payload=mock_geocode_response, repeat=repeat)
+    server.get(TIMEZONE_URL, payload=mock_timezone_response, repeat=repeat)
+
+
+async def test_login(server, websession):
+    mock_login(server)
+
+    gaposa = Gaposa("mock_api_key", websession=websession)
+    await gaposa.login("mock_email", "mock_password")
+
+    assert len(gaposa.clients) == 1
+    client, user = gaposa.clients[0]
+    assert client.id == "mock_client_id"
+    assert user.name == "mock_name"
+    assert [device.serial for device in client.devices] == ["mock_serial"]
+    assert client.devices[0].location == (51.5, -0.1)
+    assert client.devices[0].timezone == "Europe/London"
+
+    await gaposa.close()
+    assert not websession.closed
+
+
+async def test_login_auth_failure(server, websession):
+    server.post(SIGN_IN_URL, status=400)
+
+    gaposa = Gaposa("mock_api_key", websession=websession)
+    with pytest.raises(FirebaseAuthException):
+        await gaposa.login("mock_email", "mock_password")
+
+
+async def test_login_after_close(server):
+    mock_login(server, repeat=True)
+
+    gaposa = Gaposa("mock_api_key")
+    await gaposa.login("mock_email", "mock_password")
+    firstSession = gaposa.session
+    await gaposa.close()
+    assert firstSession is not None and firstSession.closed
+    assert gaposa.firebase is None and gaposa.api is None
+
+    await gaposa.login("mock_email", "mock_password")
+    assert gaposa.session is not None and not gaposa.session.closed
+    assert len(gaposa.clients) == 1
+    await gaposa.close()
@@ -1,20 +1,13 @@
+import weakref
 from typing import Dict
 
 import pytest
 
-from pygaposa.api import GaposaApi
 from pygaposa.api_types import Channel, Command, GroupInfo
-from pygaposa.devicebase import DeviceBase
 from pygaposa.motor import MotorImpl
 
 
 class TestMotor:
-    @pytest.fixture
-    def device(self, mocker):
-        device = mocker.Mock(spec=DeviceBase)
-        device.api = mocker.Mock(spec=GaposaApi)
-        return device
-
     @pytest.fixture
     def motor(self, device):
         id = "1"
@@ -31,16 +24,24 @@ class TestMotor:
         return MotorImpl(device, id, info)
 
     def test_init(self, motor, device):
-        assert motor.device == device
-        assert motor.id == "1"
-        assert motor.name == "Test Motor"
-        assert motor.status == 0
-        assert motor.state == "UP"
-        assert motor.running is False
-        assert motor.percent == 0
-        assert motor.paused is False
-        assert motor.location == "Living Room"
-        assert motor.icon == "motor_icon"
+        expected = {
+            "device": device,
+            "id": "1",
+            "name": "Test Motor",
+            "status": 0,
+            "state": "UP",
+            "running": False,
+            "percent": 0,
+            "paused": False,
+            "location": "Living Room",
+            "icon": "motor_icon",
+        }
+        assert {key: getattr(motor, key) for key in expected} == expected
+
+    def test_slots(self, motor):
+        assert weakref.ref(motor)() is motor
+        with pytest.raises(AttributeError):
+            motor.extra = True
 
     def test_update(self, motor):
         info: Channel = {
@@ -54,31 +55,31 @@ class TestMotor:
             "Icon": "updated_motor_icon",
         }
         motor.update(info)
-        assert motor.name == "Updated Motor"
-        assert motor.status == 1
-        assert motor.state == "DOWN"
-        assert motor.running is True
-        assert motor.percent == 100
-        assert motor.paused is True
-        assert motor.location == "Annex"
-        assert motor.icon == "updated_motor_icon"
-
-    async def test_up(self, motor, device):
-        await motor.up()
-        device.api.control.assert_called_once_with(Command.UP, "channel", "1")
-        device.update.assert_awaited_once()
-
-    async def test_down(self, motor, device):
-        await motor.down()
-        device.api.control.assert_called_once_with(Command.DOWN, "channel", "1")
-        device.update.assert_awaited_once()
-
-    async def test_stop(self, motor, device):
-        await motor.stop()
-        device.api.control.assert_called_once_with(Command.STOP, "channel", "1")
-        device.update.assert_awaited_once()
+        expected = {
+            "name": "Updated Motor",
+            "status": 1,
+            "state": "DOWN",
+            "running": True,
+            "percent": 100,
+            "paused": True,
+            "location": "Annex",
+            "icon": "updated_motor_icon",
+        }
+        assert {key: getattr(motor, key) for key in expected} == expected
 
-    async def test_preset(self, motor, device):
-        await motor.preset()
-        device.api.control.assert_called_once_with(Command.PRESET, "channel", "1")
+    @pytest.mark.parametrize(
+        "method, command",
+        [
+            (MotorImpl.up, Command.UP),
+            (MotorImpl.down, Command.DOWN),
+            (MotorImpl.stop, Command.STOP),
+            (MotorImpl.preset, Command.PRESET),
+        ],
+        ids=["up", "down", "stop", "preset"],
+    )
+    async def test_control(self, motor, device, method, command):
+        await method(motor)
+        device.api.control.assert_called_once_with(
+            command, "channel", "1", serial="mock_serial"
+        )
         device.update.assert_awaited_once()
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from logging import Logger
 from unittest.mock import AsyncMock, MagicMock
 
@@ -39,16 +40,110 @@ async def test_wait_for_condition(poll_manager, mock_poll) -> None:
     condition.assert_called_once()
 
 
+async def test_wait_for_condition_already_met(poll_manager, mock_poll) -> None:
+    condition = MagicMock(return_value=True)
+    await poll_manager.wait_for_condition(condition, allow_cached=True)
+    mock_poll.assert_not_awaited()
+    condition.assert_called_once()
+
+
+async def test_wait_for_condition_confirms_unchanged(poll_manager, mock_poll) -> None:
+    mock_poll.return_value = False
+    await poll_manager.wait_for_update()
+    condition = MagicMock(return_value=True)
+    await poll_manager.wait_for_condition(condition)
+    assert mock_poll.await_count == 2
+    condition.assert_called_once()
+
+
 async def test_wait_for_condition_with_timeout(poll_manager, mock_poll) -> None:
-    condition = MagicMock(return_value=False)
+    poll_manager.poll_interval = 0
+    calls = 0
+
+    def condition() -> bool:
+        nonlocal calls
+        calls += 1
+        return False
+
     await poll_manager.wait_for_condition(condition)
     mock_poll.assert_awaited()
-    condition.assert_called()
+    assert calls > 0
     assert mock_poll.call_count == 6
 
 
 async def test_wait_for_condition_three_times(poll_manager, mock_poll) -> None:
-    condition = MagicMock(side_effect=[False, False, True])
+    poll_manager.poll_interval = 0
+    results = iter([False, False, True])
+    await poll_manager.wait_for_condition(results.__next__)
+    assert mock_poll.await_count == 3
+    assert next(results, None) is None
+
+
+async def test_new_condition_wakes_polling(poll_manager, mock_poll) -> None:
+    condition = MagicMock(side_effect=[False, True])
+    waiter = asyncio.create_task(poll_manager.wait_for_condition(condition))
+    await asyncio.sleep(0.1)
+    assert mock_poll.await_count == 1
+    await asyncio.wait_for(poll_manager.wait_for_update(), 1)
+    assert mock_poll.await_count == 2
+    await waiter
+
+
+async def test_next_interval_uses_settle_times(poll_manager) -> None:
+    assert poll_manager.nextInterval() == 2
+    poll_manager.settleTimes.append(0.5)
+    poll_manager.waiters[asyncio.Event()] = (MagicMock(), time.monotonic())
+    assert 0 < poll_manager.nextInterval() <= 0.5
+
+
+async def test_wait_for_condition_records_settle_time(poll_manager) -> None:
+    poll_manager.poll_interval = 0
+    condition = MagicMock(side_effect=[False, True])
     await poll_manager.wait_for_condition(condition)
+    assert len(poll_manager.settleTimes) == 1
+
+
+async def test_unchanged_poll_skips_conditions(poll_manager, mock_poll) -> None:
+    poll_manager.poll_interval = 0
+    mock_poll.side_effect = [True, False, True]
+    condition = MagicMock(side_effect=[False, True])
+    await poll_manager.wait_for_condition(condition)
+    assert mock_poll.await_count == 3
+    assert condition.call_count == 2
+
+
+async def test_wait_for_update_reuses_fresh_poll(poll_manager, mock_poll) -> None:
+    await poll_manager.wait_for_update()
+    await poll_manager.wait_for_update(allow_cached=True)
+    mock_poll.assert_awaited_once()
+
+
+async def test_wait_for_update_polls_after_write(poll_manager, mock_poll) -> None:
+    await poll_manager.wait_for_update()
+    await poll_manager.wait_for_update()
+    assert mock_poll.await_count == 2
+
+
+async def test_condition_added_during_poll_wakes_once(poll_manager, mock_poll) -> None:
+    async def slowPoll():
+        await asyncio.sleep(0.05)
+
+    mock_poll.side_effect = slowPoll
+    met = False
+    waiter = asyncio.create_task(poll_manager.wait_for_condition(lambda: met))
+    await asyncio.sleep(0.1)
+    assert mock_poll.await_count == 1
+
+    # Wake the sleeping task, then add another condition while it polls
+    update = asyncio.create_task(poll_manager.wait_for_update())
+    await asyncio.sleep(0.02)
+    await poll_manager.wait_for_update()
+    await update
+    # The second poll started before the last update was added, so a third
+    # poll answers it, and then the task goes back to sleep
+    await asyncio.sleep(0.2)
     assert mock_poll.await_count == 3
-    condition.assert_called_with()
+
+    met = True
+    await asyncio.wait_for(poll_manager.wait_for_update(), 1)
+    await waiter